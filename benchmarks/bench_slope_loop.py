@@ -0,0 +1,277 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Benchmarks for loop sorting, slope solving and mesh I/O on synthetic meshes
+#   and for the whole operators passes (mesh read, ordering with cache, solve, mesh write)
+#
+#   Without Blender (bpy / bmesh stand-in is used):
+#       python benchmarks/bench_slope_loop.py --sizes 1000 10000 100000 1000000 --output results.json
+#   In Blender:
+#       blender -b --python benchmarks/bench_slope_loop.py -- --output results.json
+#   Compare with previous results:
+#       python benchmarks/bench_slope_loop.py --compare results_old.json --output results.json
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import stand_in
+STAND_IN = stand_in.install()
+import bpy
+import bmesh
+import slope_loop
+from slope_loop.addon import LastSolveCache, LoopsCache, MeshIO, SlopeLoop, core
+
+SCENARIOS = ('polyline', 'contours', 'grid')
+# vertices in one contour for 'contours' scenario
+CONTOUR_LENGTH = 1000
+
+
+# SYNTHETIC MESHES
+
+def polyline(size):
+    # long open polyline, all vertices selected
+    x = np.arange(size, dtype=np.float64)
+    co = np.column_stack((x, np.sin(x * 0.01) * 10.0, np.random.random(size)))
+    edges = np.column_stack((np.arange(size - 1), np.arange(1, size)))
+    return co, edges, np.ones(size, dtype=bool)
+
+
+def contours(size):
+    # many parallel contours with CONTOUR_LENGTH vertices, all vertices selected
+    count = max(size // CONTOUR_LENGTH, 1)
+    length = size // count
+    x = np.tile(np.arange(length, dtype=np.float64), count)
+    y = np.repeat(np.arange(count, dtype=np.float64) * 5.0, length)
+    co = np.column_stack((x, y + np.sin(x * 0.01), np.random.random(count * length)))
+    starts = np.arange(count * length).reshape(count, length)[:, :-1].ravel()
+    edges = np.column_stack((starts, starts + 1))
+    return co, edges, np.ones(count * length, dtype=bool)
+
+
+def grid(size):
+    # square grid with one selected row in the middle
+    side = max(int(size ** 0.5), 2)
+    x, y = np.meshgrid(np.arange(side, dtype=np.float64), np.arange(side, dtype=np.float64))
+    co = np.column_stack((x.ravel(), y.ravel(), np.random.random(side * side)))
+    indices = np.arange(side * side).reshape(side, side)
+    edges = np.concatenate((
+        np.column_stack((indices[:, :-1].ravel(), indices[:, 1:].ravel())),
+        np.column_stack((indices[:-1, :].ravel(), indices[1:, :].ravel()))
+    ))
+    select = np.zeros(side * side, dtype=bool)
+    select[indices[side // 2]] = True
+    return co, edges, select
+
+
+def mesh_object(name, co, edges, select):
+    # mesh object (real or stand-in) with vertices, edges and selection
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set('co', co.astype(np.float32).ravel())
+    mesh.vertices.foreach_set('select', select)
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set('vertices', edges.astype(np.int32).ravel())
+    edges_select = select[edges[:, 0]] & select[edges[:, 1]]
+    mesh.edges.foreach_set('select', edges_select)
+    mesh.update()
+    # active vertex - the first end of the selected loops
+    links = np.bincount(edges[edges_select].ravel(), minlength=len(co))
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.verts.ensure_lookup_table()
+    bm.select_history.add(bm.verts[int(np.argmax(links == 1))])
+    bm.to_mesh(mesh)
+    bm.free()
+    return bpy.data.objects.new(name, mesh)
+
+
+# operators context and operator without reports
+CONTEXT = types.SimpleNamespace(
+    tool_settings=types.SimpleNamespace(mesh_select_mode=(True, False, False)),
+    scene=types.SimpleNamespace(slope_loop_prop_mode='Percents')
+)
+QUIET = types.SimpleNamespace(report=lambda type, message: None)
+
+
+# BENCHMARK
+
+def measure(function, repeat):
+    # best time of repeat runs and peak memory of one run
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def phases(ob):
+    # phases of the add-on operators for the mesh object
+    #   each phase is a function without arguments, phases can use results of previous phases
+    state = {}
+
+    def mesh_read():
+        state['mesh'] = MeshIO(mesh=ob.data)
+
+    def loop_sorted():
+        # ordered loop from the first end vertex of the selection as active vertex (Make Slope ordering)
+        mesh = state['mesh']
+        selected_edges = mesh.selected_edges()
+        adjacency = core.LoopsSorter.adjacency(edges=selected_edges.tolist())
+        mesh.active = (next((vertex for vertex, linked in adjacency.items() if len(linked) == 1), None), )
+        state['loop'] = SlopeLoop._make_slope_ordering(mesh=mesh, selected_edges=selected_edges, select_mode='VERT')[0]
+
+    def loops_sorted():
+        # all selected loops (QSlope ordering)
+        state['loops'] = SlopeLoop._q_slope_ordering(mesh=state['mesh'])[0]
+
+    def each_slope():
+        loop = state['loop']
+        core.Polyline.make_slope(co=loop.co, value=10.0, mode='Percents', result_mode='EACH_SLOPE',
+                                 distances=loop.distances)
+
+    def full_slope():
+        core.Polyline.make_slope(co=state['loop'].co, value=10.0, mode='Percents', result_mode='FULL_SLOPE')
+
+    def q_slope():
+        mesh = state['mesh']
+        for loop in state['loops']:
+            heights = core.Polyline.q_slope(co=loop.co, distances=loop.distances)[0]
+            mesh.set_heights(indices=loop.indices, heights=heights)
+
+    def q_slope_threads():
+        # the same loops solved concurrently on all cpu cores and written by one bulk set
+        mesh = state['mesh']
+        loops = state['loops']
+        solved = core.Polyline.q_slope_loops(loops=loops, workers=os.cpu_count())
+        if loops:
+            mesh.set_heights(indices=np.concatenate([loop.indices for loop in loops]),
+                             heights=np.concatenate([heights for heights, _ in solved]))
+
+    def mesh_write():
+        mesh = state['mesh']
+        mesh.set_heights(indices=state['loop'].indices, heights=mesh.co[state['loop'].indices, 2])
+        mesh.write()
+
+    def align_neighbour():
+        SlopeLoop._align_neighbour(context=None, ob=ob)
+
+    def make_slope(result_mode, cached=False):
+        # Make Slope operator pass, cached - as repeated from the redo panel, with ordering from LoopsCache
+        def make_slope_pass():
+            if not cached:
+                LoopsCache.clear()
+            LastSolveCache.clear()
+            SlopeLoop._make_slope_loop(context=CONTEXT, ob=ob, slope_mode='Percents', value=10.0, op=QUIET,
+                                       result_mode=result_mode)
+        return make_slope_pass
+
+    def make_slope_tail_edit():
+        # Make Slope repeated after moving the last but one vertex of the loop
+        #   re-solved from it by the last solve of the previous pass (LastSolveCache)
+        ob.data.vertices[int(state['loop'].indices[-2])].co.x += 0.5
+        SlopeLoop._make_slope_loop(context=CONTEXT, ob=ob, slope_mode='Percents', value=10.0, op=QUIET,
+                                   result_mode='EACH_SLOPE')
+
+    def q_slope_pass():
+        LoopsCache.clear()
+        SlopeLoop._q_slope_loop(context=CONTEXT, ob=ob, op=QUIET)
+
+    return [
+        ('mesh_read', mesh_read),
+        ('loop_sorted', loop_sorted),
+        ('loops_sorted', loops_sorted),
+        ('each_slope', each_slope),
+        ('full_slope', full_slope),
+        ('q_slope', q_slope),
+        ('q_slope_threads', q_slope_threads),
+        ('mesh_write', mesh_write),
+        ('align_neighbour', align_neighbour),
+        ('op_each_slope', make_slope(result_mode='EACH_SLOPE')),
+        ('op_each_cached', make_slope(result_mode='EACH_SLOPE', cached=True)),
+        ('op_each_tail_edit', make_slope_tail_edit),
+        ('op_full_slope', make_slope(result_mode='FULL_SLOPE')),
+        ('op_q_slope', q_slope_pass)
+    ]
+
+
+def run(sizes, scenarios, repeat):
+    # run all phases for each scenario and size, returns list of results
+    generators = {'polyline': polyline, 'contours': contours, 'grid': grid}
+    results = []
+    for scenario in scenarios:
+        for size in sizes:
+            np.random.seed(0)
+            co, edges, select = generators[scenario](size=size)
+            ob = mesh_object(name=scenario + '_' + str(size), co=co, edges=edges, select=select)
+            for phase, function in phases(ob=ob):
+                seconds, peak = measure(function=function, repeat=repeat)
+                results.append({
+                    'scenario': scenario,
+                    'vertices': len(co),
+                    'selected': int(select.sum()),
+                    'phase': phase,
+                    'time': seconds,
+                    'peak_memory': peak
+                })
+                print(scenario.ljust(10) + str(len(co)).rjust(9) + '  ' + phase.ljust(16)
+                      + ('%.6f' % seconds).rjust(12) + ' s' + str(peak // 1024).rjust(10) + ' KiB')
+    return results
+
+
+def compare(results, previous):
+    # print time ratio to previous results for the same scenario, size and phase
+    previous = {(item['scenario'], item['vertices'], item['phase']): item for item in previous['results']}
+    for item in results:
+        old = previous.get((item['scenario'], item['vertices'], item['phase']))
+        if old and old['time'] > 0:
+            print(item['scenario'].ljust(10) + str(item['vertices']).rjust(9) + '  ' + item['phase'].ljust(16)
+                  + ('x %.2f' % (item['time'] / old['time'])).rjust(10))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Slope Loop benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--scenarios', nargs='*', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=3, help='runs for each phase, the best time is used')
+    parser.add_argument('--output', help='save results to json file')
+    parser.add_argument('--compare', help='json file with previous results')
+    args = parser.parse_args(argv)
+    results = run(sizes=args.sizes, scenarios=args.scenarios, repeat=max(args.repeat, 1))
+    report = {
+        'meta': {
+            'version': slope_loop.bl_info['version'],
+            'blender': None if STAND_IN else bpy.app.version,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(results=results, previous=json.load(previous))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=4)
+
+
+if __name__ == '__main__':
+    main(argv=sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:])
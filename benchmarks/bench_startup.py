@@ -0,0 +1,117 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Add-on startup cost - import, register and the first operator execution (lazy loading of the solver modules)
+#   each run is made in a new process to measure cold start
+#   without Blender the stand-in loads numpy itself, so numpy import time is not included
+#
+#   Without Blender (bpy / bmesh stand-in is used):
+#       python benchmarks/bench_startup.py --runs 10 --output startup.json
+#   In Blender:
+#       blender -b --factory-startup --python benchmarks/bench_startup.py -- --runs 10 --output startup.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# single run prints its results to stdout in a line starting with this marker
+RESULT_MARKER = 'SLOPE_LOOP_STARTUP '
+
+PHASES = ('import', 'register', 'first_use', 'unregister')
+
+# modules which should be loaded only on the first operator execution
+LAZY_MODULES = ('numpy', 'bmesh', 'slope_loop.core')
+
+
+def single():
+    # measure import, register and first use of the add-on in the current process
+    #   returns {phase: seconds, ..., 'loaded': {phase: [lazy modules loaded by this phase], ...}}
+    import stand_in
+    stand_in.install()
+    result = {'loaded': {}}
+    modules = set(sys.modules)
+    start = time.perf_counter()
+    import slope_loop
+    result['import'] = time.perf_counter() - start
+    result['loaded']['import'] = _loaded(modules=modules)
+    start = time.perf_counter()
+    slope_loop.register()
+    result['register'] = time.perf_counter() - start
+    result['loaded']['register'] = _loaded(modules=modules)
+    start = time.perf_counter()
+    slope_loop.addon.core.Polyline
+    result['first_use'] = time.perf_counter() - start
+    result['loaded']['first_use'] = _loaded(modules=modules)
+    start = time.perf_counter()
+    slope_loop.unregister()
+    result['unregister'] = time.perf_counter() - start
+    return result
+
+
+def _loaded(modules):
+    # lazy modules loaded since the modules set was taken
+    return [name for name in LAZY_MODULES if name in sys.modules and name not in modules]
+
+
+def run(runs):
+    # run single measurement in new processes, returns list of results
+    import stand_in
+    if stand_in.install():
+        command = [sys.executable, os.path.abspath(__file__), '--single']
+    else:
+        import bpy
+        command = [bpy.app.binary_path, '-b', '--factory-startup', '--python', os.path.abspath(__file__),
+                   '--', '--single']
+    results = []
+    for _ in range(runs):
+        process = subprocess.run(command, stdout=subprocess.PIPE, universal_newlines=True)
+        results.extend(json.loads(line[len(RESULT_MARKER):]) for line in process.stdout.splitlines()
+                       if line.startswith(RESULT_MARKER))
+    return results
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Slope Loop startup cost')
+    parser.add_argument('--runs', type=int, default=10, help='number of processes, median time is reported')
+    parser.add_argument('--single', action='store_true', help='one measurement in the current process')
+    parser.add_argument('--output', help='save results to json file')
+    args = parser.parse_args(argv)
+    if args.single:
+        print(RESULT_MARKER + json.dumps(single()))
+        return
+    results = run(runs=max(args.runs, 1))
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': len(results)
+        },
+        'median': {phase: median([result[phase] for result in results]) for phase in PHASES},
+        'loaded': results[0]['loaded'] if results else {}
+    }
+    for phase in PHASES:
+        print(phase.ljust(12) + ('%.6f' % report['median'][phase]).rjust(12) + ' s  '
+              + ', '.join(report['loaded'].get(phase, [])))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=4)
+
+
+if __name__ == '__main__':
+    main(argv=sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:])
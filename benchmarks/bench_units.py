@@ -0,0 +1,159 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Slope value conversion and heights solving - legacy per call / per vertex trigonometry against the grade
+# resolved once for an operation (Units.converter, Units.grade)
+#   checks that the results with LEGACY rounding are the same as the legacy ones
+#
+#       python benchmarks/bench_units.py --sizes 1000 10000 100000 --output units.json
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from slope_loop.core import Loop, SlopeSolver, Units
+
+MODES = ('Degrees', 'Permilles', 'Percents')
+# slope values converted in 'convert' phase for each mode
+VALUES = 10000
+
+
+# LEGACY
+
+def legacy_mode_to_radians(value, mode):
+    # conversion with the mode dispatch on each call
+    if mode == 'Degrees':
+        return math.radians(value)
+    elif mode == 'Permilles':
+        return round(math.atan(value / 1000.0), 4)
+    elif mode == 'Percents':
+        return round(math.atan(value / 100), 4)
+
+
+def legacy_slope_to_mode(radians, mode):
+    if mode == 'Degrees':
+        return math.degrees(radians)
+    elif mode == 'Permilles':
+        return round(math.tan(radians), 4) * 1000.0
+    elif mode == 'Percents':
+        return round(math.tan(radians), 4) * 100
+
+
+def legacy_each_slope(co, radians):
+    # heights with the tangent counted for each pair of vertices
+    heights = [co[0][2]]
+    for v1, v2 in zip(co[:-1], co[1:]):
+        length = math.hypot(v2[0] - v1[0], v2[1] - v1[1])
+        heights.append(heights[-1] + length / round(math.tan(math.radians(90) - radians), 4))
+    return heights
+
+
+# BENCHMARK
+
+def measure(function, repeat):
+    # best time of repeat runs and the result of the last run
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def convert(mode, repeat):
+    # VALUES slope values to radians and back, returns [(phase, seconds, max difference), ...]
+    values = [value * 0.01 for value in range(VALUES)]
+    legacy_time, legacy = measure(
+        function=lambda: [legacy_slope_to_mode(radians=legacy_mode_to_radians(value=value, mode=mode), mode=mode)
+                          for value in values],
+        repeat=repeat
+    )
+    converter = Units.converter(mode=mode, rounding='LEGACY')
+    resolved_time, resolved = measure(
+        function=lambda: [converter.from_radians(radians=converter.to_radians(value=value)) for value in values],
+        repeat=repeat
+    )
+    difference = max(abs(a - b) for a, b in zip(legacy, resolved))
+    return [('convert_legacy', legacy_time, 0.0), ('convert_resolved', resolved_time, difference)]
+
+
+def solve(size, mode, value, repeat):
+    # heights of the loop with size vertices, returns [(phase, seconds, max relative difference), ...]
+    x = np.arange(size, dtype=np.float64)
+    co = np.column_stack((x, np.sin(x * 0.01) * 10.0, np.random.random(size)))
+    co_list = co.tolist()
+    loop = Loop(indices=np.arange(size), co=co)
+    legacy_time, legacy = measure(
+        function=lambda: legacy_each_slope(co=co_list, radians=legacy_mode_to_radians(value=value, mode=mode)),
+        repeat=repeat
+    )
+    legacy = np.array(legacy)
+    grade_time, heights = measure(
+        function=lambda: SlopeSolver.each_slope(co=co, grade=Units.grade(value=value, mode=mode, rounding='LEGACY'),
+                                                distances=loop.distances),
+        repeat=repeat
+    )
+    return [
+        ('solve_legacy', legacy_time, 0.0),
+        ('solve_grade', grade_time, float(np.abs(heights - legacy).max() / max(np.abs(legacy).max(), 1.0)))
+    ]
+
+
+def run(sizes, value, repeat):
+    # run all phases for each mode and size, returns list of results
+    results = []
+    for mode in MODES:
+        phases = [(VALUES, phase) for phase in convert(mode=mode, repeat=repeat)]
+        for size in sizes:
+            np.random.seed(0)
+            phases.extend((size, phase) for phase in solve(size=size, mode=mode, value=value, repeat=repeat))
+        for count, (phase, seconds, difference) in phases:
+            results.append({
+                'mode': mode,
+                'count': count,
+                'phase': phase,
+                'time': seconds,
+                'difference': difference
+            })
+            print(mode.ljust(10) + str(count).rjust(9) + '  ' + phase.ljust(18)
+                  + ('%.6f' % seconds).rjust(12) + ' s' + ('%.3g' % difference).rjust(12))
+    return results
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Slope Loop units conversion benchmark')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1000, 10000, 100000])
+    parser.add_argument('--value', type=float, default=10.0, help='slope value for solving')
+    parser.add_argument('--repeat', type=int, default=3, help='runs for each phase, the best time is used')
+    parser.add_argument('--tolerance', type=float, default=1e-9,
+                        help='max allowed relative difference with legacy results')
+    parser.add_argument('--output', help='save results to json file')
+    args = parser.parse_args(argv)
+    results = run(sizes=args.sizes, value=args.value, repeat=max(args.repeat, 1))
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=4)
+    # non zero exit code if results differ from the legacy ones
+    return 0 if all(item['difference'] <= args.tolerance for item in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(argv=sys.argv[1:]))
@@ -0,0 +1,212 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Lightweight bpy / bmesh stand-in for running benchmarks without Blender
+#   only the parts used by the add-on module import, by MeshIO and by BMeshIO are implemented,
+#   mesh data is stored in NumPy arrays with foreach_get / foreach_set bulk access
+
+import sys
+import types
+import numpy as np
+
+
+class _Collection:
+
+    # mesh elements collection with NumPy arrays for attributes
+
+    def __init__(self, attributes):
+        # attributes - {name: (items per element, dtype)}
+        self._attributes = attributes
+        self._data = {name: np.zeros((0, size), dtype=dtype) for name, (size, dtype) in attributes.items()}
+
+    def __len__(self):
+        return len(next(iter(self._data.values())))
+
+    def add(self, count):
+        for name, array in self._data.items():
+            self._data[name] = np.concatenate((array, np.zeros((count, array.shape[1]), dtype=array.dtype)))
+
+    def foreach_get(self, attribute, buffer):
+        buffer[:] = self._data[attribute].ravel()
+
+    def foreach_set(self, attribute, buffer):
+        self._data[attribute].ravel()[:] = buffer
+
+    def __getitem__(self, index):
+        return _Element(collection=self, index=index)
+
+
+class _Element:
+
+    # single element of the collection, gives access to coordinates by co.x, co.y, co.z
+
+    def __init__(self, collection, index):
+        self.co = _Co(array=collection._data['co'], index=index)
+
+
+class _Co:
+
+    def __init__(self, array, index):
+        self._array = array
+        self._index = index
+
+    x = property(lambda self: self._array[self._index, 0], lambda self, value: self._set(0, value))
+    y = property(lambda self: self._array[self._index, 1], lambda self, value: self._set(1, value))
+    z = property(lambda self: self._array[self._index, 2], lambda self, value: self._set(2, value))
+
+    def _set(self, axis, value):
+        self._array[self._index, axis] = value
+
+
+class Mesh:
+
+    # stand-in for bpy.types.Mesh
+
+    def __init__(self, name):
+        self.name = name
+        self.vertices = _Collection(attributes={
+            'co': (3, np.float32),
+            'select': (1, bool),
+            'hide': (1, bool)
+        })
+        self.edges = _Collection(attributes={
+            'vertices': (2, np.int32),
+            'select': (1, bool),
+            'hide': (1, bool)
+        })
+        # vertices indices of the select history, the last is active
+        self.select_history = []
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def as_pointer(self):
+        return id(self)
+
+
+class Object:
+
+    # stand-in for bpy.types.Object
+
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+        self.type = 'MESH'
+        self.mode = 'OBJECT'
+
+    def as_pointer(self):
+        return id(self)
+
+
+# BMESH
+
+class BMVert:
+
+    # stand-in for bmesh.types.BMVert
+
+    def __init__(self, index, co, select, hide):
+        self.index = index
+        self.co = _BMCo(co)
+        self.select = select
+        self.hide = hide
+
+
+class _BMCo(list):
+
+    # vertex coordinates with access by co.z
+
+    z = property(lambda self: self[2], lambda self, value: self.__setitem__(2, value))
+
+
+class BMEdge:
+
+    # stand-in for bmesh.types.BMEdge
+
+    def __init__(self, verts, select):
+        self.verts = verts
+        self.select = select
+
+
+class _BMSequence(list):
+
+    def ensure_lookup_table(self):
+        pass
+
+    def index_update(self):
+        pass
+
+
+class _BMSelectHistory(list):
+
+    active = property(lambda self: self[-1] if self else None)
+
+    def add(self, element):
+        self.append(element)
+
+
+class BMesh:
+
+    # stand-in for bmesh.types.BMesh with vertices and edges only
+
+    def __init__(self):
+        self.verts = _BMSequence()
+        self.edges = _BMSequence()
+        self.select_history = _BMSelectHistory()
+
+    def from_mesh(self, mesh):
+        co = mesh.vertices._data['co'].tolist()
+        select = mesh.vertices._data['select'].ravel().tolist()
+        hide = mesh.vertices._data['hide'].ravel().tolist()
+        self.verts = _BMSequence(BMVert(index=index, co=co[index], select=select[index], hide=hide[index])
+                                 for index in range(len(co)))
+        self.edges = _BMSequence(BMEdge(verts=(self.verts[v1], self.verts[v2]), select=select)
+                                 for (v1, v2), select in zip(mesh.edges._data['vertices'].tolist(),
+                                                             mesh.edges._data['select'].ravel().tolist()))
+        self.select_history = _BMSelectHistory(self.verts[index] for index in mesh.select_history)
+
+    def to_mesh(self, mesh):
+        mesh.vertices._data['co'][:] = [vert.co for vert in self.verts]
+        mesh.select_history = [vert.index for vert in self.select_history]
+
+    def free(self):
+        self.verts = _BMSequence()
+        self.edges = _BMSequence()
+        self.select_history = _BMSelectHistory()
+
+
+def install():
+    # register stand-in modules for bpy and bmesh if Blender is not available
+    #   returns True if stand-in is used
+    try:
+        import bpy
+        return False
+    except ImportError:
+        pass
+    bpy = types.ModuleType('bpy')
+    bpy.props = types.ModuleType('bpy.props')
+    for name in ('BoolProperty', 'EnumProperty', 'FloatProperty', 'IntProperty', 'StringProperty'):
+        setattr(bpy.props, name, lambda **kwargs: None)
+    bpy.types = types.ModuleType('bpy.types')
+    for name in ('Operator', 'Panel', 'Scene', 'PropertyGroup'):
+        setattr(bpy.types, name, type(name, (), {'is_registered': False}))
+    bpy.utils = types.ModuleType('bpy.utils')
+    bpy.utils.register_class = bpy.utils.unregister_class = lambda cls: None
+    bpy.data = types.SimpleNamespace(
+        meshes=types.SimpleNamespace(new=lambda name: Mesh(name=name)),
+        objects=types.SimpleNamespace(new=lambda name, object_data: Object(name=name, data=object_data))
+    )
+    bpy.app = types.SimpleNamespace(version=(0, 0, 0), background=True)
+    bmesh = types.ModuleType('bmesh')
+    bmesh.types = types.SimpleNamespace(BMVert=BMVert, BMEdge=BMEdge, BMesh=BMesh)
+    bmesh.new = BMesh
+    sys.modules.update({
+        'bpy': bpy,
+        'bpy.props': bpy.props,
+        'bpy.types': bpy.types,
+        'bpy.utils': bpy.utils,
+        'bmesh': bmesh
+    })
+    return True
@@ -0,0 +1,41 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Slope Loop package
+#   addon - Blender add-on operators and panel, imported on register
+#   core - slope math without Blender, can be imported standalone: from slope_loop.core import Polyline
+#   batch - batch processing of .blend files in headless Blender workers
+
+bl_info = {
+    "name": "Slope Loop",
+    "description": "Modifies selected loop to create uniform slope",
+    "author": "Nikita Akimov, Paul Kotelevets",
+    "version": (1, 2, 0),
+    "blender": (2, 79, 0),
+    "location": "View3D > Tool panel > 1D > Slope Loop",
+    "doc_url": "https://github.com/Korchy/1d_slope_loop",
+    "tracker_url": "https://github.com/Korchy/1d_slope_loop",
+    "category": "All"
+}
+
+# Reload Scripts in Blender reloads only the package - reload its already imported modules too
+if 'addon' in locals():
+    import importlib
+    if 'core' in locals():
+        importlib.reload(core)
+    importlib.reload(addon)
+
+
+def register(ui=None):
+    # ui - register the panel, by default only with Blender UI (not in background mode)
+    from . import addon
+    addon.register(ui=ui)
+
+
+def unregister(ui=None):
+    # ui - unregister the panel, by default if it was registered
+    from . import addon
+    addon.unregister(ui=ui)
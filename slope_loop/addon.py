@@ -0,0 +1,1399 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Slope Loop add-on - operators and panel, registered by the package register()
+
+import bpy
+import importlib
+import json
+import math
+import time
+from collections import OrderedDict
+from bpy.props import BoolProperty, EnumProperty, FloatProperty, IntProperty, StringProperty
+from bpy.types import Operator, Panel, Scene
+from bpy.utils import register_class, unregister_class
+
+
+# LAZY MODULES
+
+class LazyModule:
+
+    # Module imported on the first access to its attributes, keeps add-on import and register cheap
+    #   replaces itself in this module globals by the imported module, so the next accesses are direct
+
+    def __init__(self, alias, name, package=None):
+        self._alias = alias
+        self._name = name
+        self._package = package
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self._name, self._package)
+        # direct access from other modules which have imported the proxy
+        self.__dict__.update(module.__dict__)
+        globals()[self._alias] = module
+        return getattr(module, attribute)
+
+
+bmesh = LazyModule(alias='bmesh', name='bmesh')
+np = LazyModule(alias='np', name='numpy')
+core = LazyModule(alias='core', name='.core', package=__package__)
+
+
+# MESH DATA
+
+class MeshIO:
+
+    # Mesh data in flat arrays through foreach_get / foreach_set bulk access
+    #   works with the mesh in OBJECT mode, reads the whole mesh without bmesh copy,
+    #   writes back only Z coordinates of changed vertices, marked in the mask of all vertices
+
+    # while changed vertices are less than 1/_bulk_write_ratio of the mesh - write them one by one,
+    #   else - write all coordinates by one foreach_set call
+    _bulk_write_ratio = 64
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        vertices_count = len(mesh.vertices)
+        edges_count = len(mesh.edges)
+        self.select = self._foreach_get(mesh.vertices, 'select', vertices_count, bool)
+        self.hide = self._foreach_get(mesh.vertices, 'hide', vertices_count, bool)
+        self.co = self._foreach_get(mesh.vertices, 'co', vertices_count * 3, np.float32).reshape(-1, 3)\
+            .astype(np.float64)
+        self.edges = self._foreach_get(mesh.edges, 'vertices', edges_count * 2, np.int32).reshape(-1, 2)
+        self.edges_select = self._foreach_get(mesh.edges, 'select', edges_count, bool)
+        # active element of the select history, available only through bmesh
+        self.active = None
+        self._changed = np.zeros(vertices_count, dtype=bool)
+
+    @classmethod
+    def has_selection(cls, mesh):
+        # check if mesh has selected vertices reading only vertices selection
+        return bool(cls._foreach_get(mesh.vertices, 'select', len(mesh.vertices), bool).any())
+
+    def selected_vertices(self):
+        # indices of selected vertices
+        return np.flatnonzero(self.select)
+
+    def selected_edges(self):
+        # (E, 2) array with vertices indices of selected edges
+        return self.edges[self.edges_select]
+
+    def set_heights(self, indices, heights):
+        # set new Z coordinates for vertices by indices
+        self.co[indices, 2] = heights
+        self._changed[indices] = True
+
+    def write(self):
+        # save changed Z coordinates to mesh
+        changed = np.flatnonzero(self._changed)
+        if changed.size:
+            if changed.size * self._bulk_write_ratio < len(self.co):
+                vertices = self.mesh.vertices
+                for index, height in zip(changed.tolist(), self.co[changed, 2].tolist()):
+                    vertices[index].co.z = height
+            else:
+                self.mesh.vertices.foreach_set('co', self.co.astype(np.float32).ravel())
+            self.mesh.update()
+            self._changed[:] = False
+
+    def set_vertex_colors(self, name, colors):
+        # save (V, 3) RGB colors of vertices to the vertex colors layer, the layer is created if not exists
+        layer = self.mesh.vertex_colors.get(name) or self.mesh.vertex_colors.new(name=name)
+        loops_vertices = self._foreach_get(self.mesh.loops, 'vertex_index', len(self.mesh.loops), np.int32)
+        layer.data.foreach_set('color', colors[loops_vertices].astype(np.float32).ravel())
+        self.mesh.update()
+
+    def free(self):
+        self._changed[:] = False
+
+    @staticmethod
+    def _foreach_get(collection, attribute, size, dtype):
+        # read attribute of all collection items to flat array
+        buffer = np.empty(size, dtype=dtype)
+        collection.foreach_get(attribute, buffer)
+        return buffer
+
+
+class BMeshIO(MeshIO):
+
+    # Mesh data in flat arrays through bmesh
+    #   fallback for the cases which need bmesh data (select history)
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.bm = self._bmesh(mesh=mesh)
+        self.bm.verts.ensure_lookup_table()
+        self.bm.edges.ensure_lookup_table()
+        self.select = np.array([vert.select for vert in self.bm.verts], dtype=bool)
+        self.hide = np.array([vert.hide for vert in self.bm.verts], dtype=bool)
+        self.co = np.array([vert.co[:] for vert in self.bm.verts], dtype=np.float64).reshape(-1, 3)
+        self.edges = np.array([(edge.verts[0].index, edge.verts[1].index) for edge in self.bm.edges],
+                              dtype=np.int32).reshape(-1, 2)
+        self.edges_select = np.array([edge.select for edge in self.bm.edges], dtype=bool)
+        # vertices indices of the active element of the select history
+        active = self.bm.select_history.active
+        if active is None:
+            self.active = None
+        elif isinstance(active, bmesh.types.BMVert):
+            self.active = (active.index, )
+        else:
+            self.active = tuple(vert.index for vert in active.verts)
+        self._changed = np.zeros(len(self.co), dtype=bool)
+
+    @staticmethod
+    def _bmesh(mesh):
+        # get bmesh from mesh
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        return bm
+
+    def write(self):
+        # save changed Z coordinates to mesh
+        changed = np.flatnonzero(self._changed)
+        if changed.size:
+            verts = self.bm.verts
+            for index, height in zip(changed.tolist(), self.co[changed, 2].tolist()):
+                verts[index].co.z = height
+            self.bm.to_mesh(self.mesh)
+            self._changed[:] = False
+
+    def free(self):
+        self.bm.free()
+        self._changed[:] = False
+
+
+class EditBMeshIO(BMeshIO):
+
+    # Mesh data in flat arrays through bmesh of the mesh in EDIT mode
+    #   works in place, without switching to OBJECT mode and back
+
+    @staticmethod
+    def _bmesh(mesh):
+        # get bmesh of the edit mesh
+        bm = bmesh.from_edit_mesh(mesh)
+        bm.verts.index_update()
+        bm.edges.index_update()
+        return bm
+
+    def write(self):
+        # save changed Z coordinates to the edit mesh
+        changed = np.flatnonzero(self._changed)
+        if changed.size:
+            verts = self.bm.verts
+            for index, height in zip(changed.tolist(), self.co[changed, 2].tolist()):
+                verts[index].co.z = height
+            bmesh.update_edit_mesh(self.mesh)
+            self._changed[:] = False
+
+    def set_vertex_colors(self, name, colors):
+        # save (V, 3) RGB colors of vertices to the bmesh loops color layer, the layer is created if not exists
+        layer = self.bm.loops.layers.color.get(name) or self.bm.loops.layers.color.new(name)
+        colors = colors.tolist()
+        for face in self.bm.faces:
+            for loop in face.loops:
+                loop[layer] = colors[loop.vert.index]
+        bmesh.update_edit_mesh(self.mesh)
+
+    def free(self):
+        # edit mesh bmesh is owned by blender
+        self._changed[:] = False
+
+
+# LOOPS CACHE
+
+class LoopsCache:
+
+    # LRU cache of ordered selected loops for repeated operations on the same selection (redo panel)
+    #   key - object, mesh data and fingerprint of topology, selection and selected vertices coordinates,
+    #   so any change of them gives new key and the old value is evicted when cache size is exceeded
+    #   size - max number of values, max_bytes - max size of the values arrays, values over max_bytes are not cached
+
+    size = 16
+    max_bytes = 64 * 1024 * 1024
+
+    _cache = OrderedDict()
+    _bytes = 0
+
+    @staticmethod
+    def key(ob, mesh, operation, **kwargs):
+        # get cache key for the object mesh data (MeshIO) and operation parameters
+        selected = mesh.selected_vertices()
+        return (
+            ob.as_pointer(),
+            ob.data.as_pointer(),
+            operation,
+            len(mesh.co),
+            len(mesh.edges),
+            hash(selected.tobytes()),
+            hash(mesh.selected_edges().tobytes()),
+            hash(mesh.co[selected].tobytes()),
+            mesh.active
+        ) + tuple(sorted(kwargs.items()))
+
+    @classmethod
+    def get(cls, key):
+        # get value by key, None if not cached
+        item = cls._cache.get(key)
+        if item is None:
+            return None
+        cls._cache.move_to_end(key)
+        return item[0]
+
+    @classmethod
+    def put(cls, key, value):
+        # add value to cache, remove the least recently used values over the cache size or bytes
+        nbytes = cls.nbytes(value=value)
+        if key in cls._cache:
+            cls._bytes -= cls._cache.pop(key)[1]
+        if nbytes > cls.max_bytes:
+            return
+        cls._cache[key] = (value, nbytes)
+        cls._bytes += nbytes
+        while len(cls._cache) > cls.size or cls._bytes > cls.max_bytes:
+            cls._bytes -= cls._cache.popitem(last=False)[1][1]
+
+    @classmethod
+    def nbytes(cls, value):
+        # size of arrays in the value - array, core.Loop or tuple / list of them
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        elif isinstance(value, core.Loop):
+            return sum(cls.nbytes(value=getattr(value, name)) for name in ('indices', 'co', 'lengths', 'distances'))
+        elif isinstance(value, (tuple, list)):
+            return sum(cls.nbytes(value=item) for item in value)
+        return 0
+
+    @classmethod
+    def clear(cls):
+        cls._cache.clear()
+        cls._bytes = 0
+
+
+class LastSolveCache(LoopsCache):
+
+    # Last solved loop of the objects for re-solving only the changed part of it on the next run (Make Slope)
+    #   key - object, mesh data and slope parameters, value - (active element, core.Loop with solved coordinates)
+
+    size = 4
+
+    _cache = OrderedDict()
+    _bytes = 0
+
+
+# STATS
+
+class SlopeLoopStats:
+
+    # Per-phase wall time and counters of the operations
+    #   enabled by SlopeLoopStats.enabled or by the scene 'slope_loop_prop_stats' property,
+    #   when disabled - shared DisabledStats object with empty methods is used
+    #   results are reported to the operator, saved to the scene 'slope_loop_prop_stats_last' property (json)
+    #   and passed to the handlers
+
+    enabled = False
+
+    # functions called with stats dictionary after each operation: handler(stats)
+    handlers = []
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.phases = OrderedDict()
+        self.counters = OrderedDict()
+        self._start = time.perf_counter()
+        self._lap = self._start
+
+    @classmethod
+    def start(cls, operation, context=None):
+        # get stats for the operation
+        if cls.enabled or (context is not None and getattr(context.scene, 'slope_loop_prop_stats', False)):
+            return cls(operation=operation)
+        return DisabledStats
+
+    def lap(self, phase=None):
+        # add time from the previous lap to the phase, without phase - just start new lap
+        now = time.perf_counter()
+        if phase:
+            self.phases[phase] = self.phases.get(phase, 0.0) + now - self._lap
+        self._lap = now
+
+    def count(self, counter, value=1):
+        # add value to the counter
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def as_dict(self):
+        return OrderedDict((
+            ('operation', self.operation),
+            ('time', self._lap - self._start),
+            ('phases', self.phases),
+            ('counters', self.counters)
+        ))
+
+    def finish(self, context=None, op=None):
+        # report stats and pass them to the handlers
+        self.lap()
+        stats = self.as_dict()
+        SlopeLoop._report(
+            op=op,
+            type={'INFO'},
+            message=self.operation + ': ' + str(round(stats['time'] * 1000.0, 2)) + ' ms ('
+                    + ', '.join(phase + ' ' + str(round(seconds * 1000.0, 2)) for phase, seconds in self.phases.items())
+                    + '), ' + ', '.join(counter + ' ' + str(value) for counter, value in self.counters.items())
+        )
+        if context is not None and hasattr(context.scene, 'slope_loop_prop_stats_last'):
+            context.scene.slope_loop_prop_stats_last = json.dumps(stats)
+        for handler in self.handlers:
+            handler(stats)
+
+
+class DisabledStats:
+
+    # Stats with empty methods for near-zero cost when stats are disabled
+
+    @staticmethod
+    def lap(phase=None):
+        pass
+
+    @staticmethod
+    def count(counter, value=1):
+        pass
+
+    @staticmethod
+    def finish(context=None, op=None):
+        pass
+
+
+# MAIN CLASS
+
+class SlopeLoop:
+
+    # one of core.Polyline.result_modes, default for make_slope_loop
+    #   'FULL_SLOPE' for setting desired slope value from first to last point
+    #   'EACH_SLOPE' for setting desired slope value for each edge of the loop
+    #   'TARGET_SLOPE' for going from start to end height within grade limits
+    _result_mode = 'EACH_SLOPE'
+
+    # loops longer than _block_size are solved by blocks with core.PolylineStream, 0 - whole loop at once
+    #   bounds the solver arrays by the block size, the mesh data is still read whole (MeshIO)
+    _block_size = 0
+
+    # threads for solving many independent loops (QSlope), 1 - sequentially,
+    #   None - by the number of cpu cores for many vertices (core.Polyline.threads_min_vertices)
+    _workers = None
+
+    # remember the last solved simple loop of each object and re-solve it only from the first vertex changed since then
+    #   if the selection is the same loop or the loop extended from its end (Make Slope)
+    _incremental = True
+
+    @classmethod
+    def make_slope_loop(cls, context, objects, slope_mode, value, op, result_mode=None, target=None):
+        # Make slope from selected loop on each of the objects
+        #   result_mode - one of core.Polyline.result_modes, SlopeLoop._result_mode if not set
+        #   target - for 'TARGET_SLOPE': {'start': height, 'end': height, 'min_grade': value, 'max_grade': value}
+        #       grades in slope_mode, start and end - heights of the loop ends if not set or None
+        #   returns {object name: number of processed loops}
+        result = {}
+        result_mode = result_mode or cls._result_mode
+        # check the parameters once before changing any of the objects
+        error = cls._check_target(target=target) if result_mode == 'TARGET_SLOPE' \
+            else cls._check_value(value=value, mode=slope_mode)
+        if error:
+            cls._report(op=op, type={'ERROR'}, message=error)
+            return result
+        stats = SlopeLoopStats.start(operation='Make Slope', context=context)
+        for ob in cls._objects_with_selection(context=context, objects=objects):
+            result[ob.name] = cls._make_slope_loop(
+                context=context,
+                ob=ob,
+                slope_mode=slope_mode,
+                value=value,
+                op=op,
+                result_mode=result_mode,
+                target=target,
+                stats=stats
+            )
+        stats.finish(context=context, op=op)
+        return result
+
+    @classmethod
+    def q_slope_loop(cls, context, objects, op):
+        # Make q-slope from selected loops on each of the objects
+        #   returns {object name: [QSlope angle in radians for each processed loop, ...]}
+        stats = SlopeLoopStats.start(operation='QSlope', context=context)
+        result = {}
+        for ob in cls._objects_with_selection(context=context, objects=objects):
+            result[ob.name] = cls._q_slope_loop(
+                context=context,
+                ob=ob,
+                op=op,
+                stats=stats
+            )
+        stats.finish(context=context, op=op)
+        return result
+
+    @classmethod
+    def align_neighbour(cls, context, objects, op=None, depth=1, falloff='CONSTANT'):
+        # align neighbour vertices of selected loops on each of the objects
+        #   returns {object name: number of aligned vertices}
+        stats = SlopeLoopStats.start(operation='Align Neighbour', context=context)
+        result = {}
+        for ob in cls._objects_with_selection(context=context, objects=objects):
+            result[ob.name] = cls._align_neighbour(
+                context=context,
+                ob=ob,
+                depth=depth,
+                falloff=falloff,
+                stats=stats
+            )
+        stats.finish(context=context, op=op)
+        return result
+
+    @classmethod
+    def analyse(cls, context, objects, scope='SELECTED', bins=10, limit=0.0, output=None, color_layer=None,
+                op=None):
+        # slope statistics of edges on each of the objects in the scene slope_loop_prop_mode units, read-only
+        #   scope - 'SELECTED' for each selected loop and all selected edges, 'MESH' for all mesh edges
+        #   limit - histograms upper bound and slope of full red color, max slope if 0
+        #   output - .json or .csv file path to export slopes of all edges
+        #   color_layer - vertex colors layer name to paint vertices by the max slope of their edges (green - red)
+        #   returns {object name: {'edges': (E, 2) array, 'slopes': (E, ) array, 'summary': {...},
+        #       'loops': [{'vertices': [...], 'closed': bool, 'slopes': (E, ) array, 'summary': {...}}, ...]}}
+        stats = SlopeLoopStats.start(operation='Slope Analysis', context=context)
+        mode = context.scene.slope_loop_prop_mode
+        objects = cls._objects_with_selection(context=context, objects=objects) if scope == 'SELECTED' \
+            else [ob for ob in objects if ob.type == 'MESH']
+        result = {}
+        for ob in objects:
+            result[ob.name] = cls._analyse(
+                ob=ob,
+                mode=mode,
+                scope=scope,
+                bins=bins,
+                limit=limit,
+                color_layer=color_layer,
+                stats=stats
+            )
+            summary = result[ob.name]['summary']
+            if summary['max'] is not None:
+                cls._report(
+                    op=op,
+                    type={'INFO'},
+                    message=ob.name + ' slope (' + mode + '): min ' + str(round(summary['min'], 4))
+                            + ', max ' + str(round(summary['max'], 4))
+                            + ', mean ' + str(round(summary['mean'], 4))
+                            + ', edges ' + str(summary['count'])
+                            + (', vertical ' + str(summary['infinite']) if summary['infinite'] else '')
+                )
+        if output:
+            cls._export_analysis(result=result, mode=mode, path=output)
+            stats.lap(phase='export')
+        stats.finish(context=context, op=op)
+        return result
+
+    @staticmethod
+    def _check_value(value, mode):
+        # error message if the slope value can't be solved, None if it can
+        try:
+            core.Units.grade(value=value, mode=mode)
+        except ValueError as error:
+            return str(error)
+        return None
+
+    @staticmethod
+    def _check_target(target):
+        # error message if the Target Slope parameters are not valid, None if they are
+        if not target or target.get('min_grade') is None or target.get('max_grade') is None:
+            return 'Target Slope needs min_grade and max_grade'
+        if target['min_grade'] > target['max_grade']:
+            return 'Min Grade is greater than Max Grade'
+        return None
+
+    @staticmethod
+    def context_objects(context):
+        # objects to process - selected objects, in EDIT mode - only edited objects
+        #   EDIT mode undo records only the edit meshes, changes of the other objects can't be undone
+        if context.active_object and context.active_object.mode == 'EDIT':
+            objects = [context.active_object]
+            objects.extend(ob for ob in context.selected_objects if ob not in objects and ob.mode == 'EDIT')
+            return objects
+        return list(context.selected_objects)
+
+    @classmethod
+    def _make_slope_loop(cls, context, ob, slope_mode, value, op, result_mode='EACH_SLOPE', target=None,
+                         stats=DisabledStats):
+        # Make slope from selected loop
+        stats.lap()
+        loops = 0
+        # selection mode
+        select_mode = 'VERT' if context.tool_settings.mesh_select_mode[0] \
+            else ('EDGE' if context.tool_settings.mesh_select_mode[1] else None)
+        # get data loop from source mesh
+        #   bmesh is needed to get active vertex from select history
+        mesh = cls._mesh_io(ob=ob, select_history=True)
+        stats.lap(phase='mesh_read')
+        cls._count_mesh(mesh=mesh, stats=stats)
+        # source vertices
+        if mesh.selected_vertices().size:
+            # if selected only one edge - only print info to INFO output
+            selected_edges = mesh.selected_edges()
+            if len(selected_edges) == 1:
+                # selected only one edge - print to INFO
+                cls._info_angle_between_two_vertices(
+                    co1=mesh.co[selected_edges[0][0]],
+                    co2=mesh.co[selected_edges[0][1]],
+                    mode=slope_mode,
+                    op=op
+                )
+            elif len(selected_edges) > 1:
+                # create slope - move all vertices starting from active vertically by slope value
+                # sorted vertices loop or network of paths starting from active vertex
+                #   by the last solved loop of the object, from cache for the same selection or new
+                last_key = (ob.as_pointer(), ob.data.as_pointer(), select_mode, value, slope_mode, result_mode,
+                            core.Units.rounding)
+                last = LastSolveCache.get(key=last_key) \
+                    if cls._incremental and result_mode in ('EACH_SLOPE', 'FULL_SLOPE') else None
+                ordering, first = cls._last_ordering(mesh=mesh, selected_edges=selected_edges, last=last) \
+                    if last else (None, 0)
+                if ordering is not None:
+                    stats.count(counter='reused_vertices', value=first)
+                else:
+                    key = LoopsCache.key(ob=ob, mesh=mesh, operation='make_slope', select_mode=select_mode,
+                                         block_size=cls._block_size)
+                    ordering = LoopsCache.get(key=key)
+                    if ordering is None:
+                        ordering = cls._make_slope_ordering(mesh=mesh, selected_edges=selected_edges,
+                                                            select_mode=select_mode)
+                        LoopsCache.put(key=key, value=ordering)
+                    else:
+                        stats.count(counter='cache_hits')
+                loop, distances, junctions, unreached = ordering
+                stats.count(counter='junctions', value=cls._info_network(junctions=junctions, unreached=unreached, op=op))
+                stats.lap(phase='ordering')
+                if loop is None:
+                    pass
+                elif result_mode == 'TARGET_SLOPE' and distances is not None:
+                    cls._report(
+                        op=op,
+                        type={'WARNING'},
+                        message='Target Slope needs a simple loop from the active vertex'
+                    )
+                elif result_mode == 'TARGET_SLOPE':
+                    # from start to end height within grade limits
+                    if loop.co is None:
+                        loop = core.Loop(indices=loop.indices, co=mesh.co[loop.indices])
+                    heights, infeasible = core.Polyline.target_slope(
+                        co=loop.co,
+                        start=loop.co[0, 2] if target.get('start') is None else target['start'],
+                        end=loop.co[-1, 2] if target.get('end') is None else target['end'],
+                        min_grade=target['min_grade'],
+                        max_grade=target['max_grade'],
+                        mode=slope_mode,
+                        lengths=loop.lengths
+                    )
+                    mesh.set_heights(indices=loop.indices, heights=heights)
+                    loops += 1
+                    stats.count(counter='infeasible', value=cls._info_infeasible(
+                        infeasible=infeasible,
+                        heights=heights,
+                        loop=loop,
+                        mode=slope_mode,
+                        op=op
+                    ))
+                    stats.lap(phase='solve')
+                    # save changed data to mesh
+                    mesh.write()
+                    stats.lap(phase='mesh_write')
+                elif distances is not None:
+                    # network - each vertex by its shortest distance from active vertex along selected edges
+                    mesh.set_heights(
+                        indices=loop.indices,
+                        heights=core.Network.make_slope(
+                            co=mesh.co,
+                            vertices=loop.indices,
+                            distances=distances,
+                            value=value,
+                            mode=slope_mode,
+                            result_mode=result_mode
+                        )
+                    )
+                    loops += 1
+                    stats.lap(phase='solve')
+                    # save changed data to mesh
+                    mesh.write()
+                    stats.lap(phase='mesh_write')
+                elif loop.co is None:
+                    # long loop - by blocks
+                    read, write = cls._loop_stream(mesh=mesh, loop=loop.indices)
+                    core.PolylineStream.make_slope(
+                        read=read,
+                        write=write,
+                        count=len(loop),
+                        value=value,
+                        mode=slope_mode,
+                        result_mode=result_mode,
+                        block_size=cls._block_size
+                    )
+                    loops += 1
+                    stats.lap(phase='solve')
+                    # save changed data to mesh
+                    mesh.write()
+                    stats.lap(phase='mesh_write')
+                else:
+                    # FULL_SLOPE - full slope (from first to last point) have the desired slope value
+                    # EACH_SLOPE - each point should have the desired slope value
+                    #   from the first vertex changed since the last solve, all vertices for the new loop
+                    heights = core.Polyline.make_slope_tail(
+                        co=loop.co,
+                        first=first,
+                        value=value,
+                        mode=slope_mode,
+                        result_mode=result_mode,
+                        distances=loop.distances
+                    )
+                    if heights is not None:
+                        mesh.set_heights(indices=loop.indices[first:], heights=heights)
+                        loops += 1
+                        if cls._incremental and result_mode in ('EACH_SLOPE', 'FULL_SLOPE'):
+                            solved = loop.co.copy()
+                            solved[first:, 2] = heights
+                            LastSolveCache.put(key=last_key, value=(mesh.active, loop.rebase(
+                                indices=loop.indices,
+                                co=solved,
+                                first=len(loop)
+                            )))
+                    stats.lap(phase='solve')
+                    # save changed data to mesh
+                    mesh.write()
+                    stats.lap(phase='mesh_write')
+        mesh.free()
+        stats.count(counter='loops', value=loops)
+        return loops
+
+    @classmethod
+    def _q_slope_loop(cls, context, ob, op, stats=DisabledStats):
+        # Make q-slope from selected loop
+        stats.lap()
+        angles = []
+        # get data loop from source mesh
+        mesh = cls._mesh_io(ob=ob)
+        stats.lap(phase='mesh_read')
+        cls._count_mesh(mesh=mesh, stats=stats)
+        # source vertices
+        selected_vertices = mesh.selected_vertices()
+        if selected_vertices.size:
+            # if selected only 2 vertices - only print info to INFO output
+            if len(selected_vertices) == 2:
+                # selected only two vertices - print to INFO
+                cls._info_angle_between_two_vertices(
+                    co1=mesh.co[selected_vertices[0]],
+                    co2=mesh.co[selected_vertices[1]],
+                    mode=context.scene.slope_loop_prop_mode,
+                    op=op
+                )
+            elif len(selected_vertices) > 2:
+                # to enable multi-select - form list of selected loops, which needs to be processed by QSlope
+                #   from cache for the same selection or new
+                key = LoopsCache.key(ob=ob, mesh=mesh, operation='q_slope', block_size=cls._block_size)
+                ordering = LoopsCache.get(key=key)
+                if ordering is None:
+                    ordering = cls._q_slope_ordering(mesh=mesh)
+                    LoopsCache.put(key=key, value=ordering)
+                else:
+                    stats.count(counter='cache_hits')
+                loops, junctions, cycles = ordering
+                stats.count(counter='junctions', value=cls._info_network(junctions=len(junctions), op=op))
+                if cycles:
+                    cls._report(
+                        op=op,
+                        type={'WARNING'},
+                        message='QSlope skipped closed loops: ' + str(cycles)
+                    )
+                stats.lap(phase='ordering')
+                # junctions are shared by several loops - keep their heights
+                junctions_heights = mesh.co[junctions, 2]
+                # loops in memory are independent - solve them concurrently, long loops - by blocks one by one
+                solved = iter(core.Polyline.q_slope_loops(
+                    loops=[loop for loop in loops if loop.co is not None],
+                    workers=cls._workers
+                ))
+                solved_loops = []
+                solved_heights = []
+                # loops without XY length or with vertical angle have no QSlope angle - skip them
+                vertical = 0
+                # process each loop of vertices
+                for loop in loops:
+                    # from the upper end of the loop to the lower one
+                    if loop.co is None:
+                        # long loop - by blocks
+                        read, write = cls._loop_stream(mesh=mesh, loop=loop.indices)
+                        try:
+                            radians = core.PolylineStream.q_slope(
+                                read=read,
+                                write=write,
+                                count=len(loop),
+                                block_size=cls._block_size
+                            )
+                        except ValueError:
+                            vertical += 1
+                            continue
+                    else:
+                        result = next(solved)
+                        if result is None:
+                            vertical += 1
+                            continue
+                        heights, radians = result
+                        solved_loops.append(loop.indices)
+                        solved_heights.append(heights)
+                    # output radians to INFO in 'Make Slope' format
+                    cls._report(
+                        op=op,
+                        type={'INFO'},
+                        message='QSlope angle: '
+                                + str(round(core.Units.slope_to_mode(radians=radians, mode=context.scene.slope_loop_prop_mode), 4))
+                                + ' ' + context.scene.slope_loop_prop_mode
+                    )
+                    angles.append(radians)
+                if vertical:
+                    cls._report(
+                        op=op,
+                        type={'WARNING'},
+                        message='QSlope skipped vertical loops: ' + str(vertical)
+                    )
+                if solved_loops:
+                    mesh.set_heights(indices=np.concatenate(solved_loops), heights=np.concatenate(solved_heights))
+                if len(junctions):
+                    mesh.set_heights(indices=junctions, heights=junctions_heights)
+                stats.lap(phase='solve')
+                # save changed data to mesh
+                mesh.write()
+                stats.lap(phase='mesh_write')
+        mesh.free()
+        stats.count(counter='loops', value=len(angles))
+        return angles
+
+    @classmethod
+    def _analyse(cls, ob, mode, scope='SELECTED', bins=10, limit=0.0, color_layer=None, stats=DisabledStats):
+        # slope statistics of selected loops or all edges of the object, mesh coordinates are not changed
+        stats.lap()
+        mesh = cls._mesh_io(ob=ob)
+        stats.lap(phase='mesh_read')
+        cls._count_mesh(mesh=mesh, stats=stats)
+        edges = mesh.selected_edges() if scope == 'SELECTED' else mesh.edges
+        slopes = core.Units.grade_to_mode(grades=core.SlopeAnalysis.grades(co=mesh.co, edges=edges), mode=mode)
+        # the same histograms bounds for all loops of the object
+        summary = core.SlopeAnalysis.summary(values=slopes, bins=bins, limit=limit)
+        limit = limit or summary['histogram']['bounds'][-1]
+        loops = []
+        if scope == 'SELECTED':
+            # each selected loop - paths between end and branching vertices and closed loops
+            paths, rings = core.LoopsSorter.paths(adjacency=core.LoopsSorter.adjacency(edges=edges.tolist()))
+            for vertices, closed in [(path, False) for path in paths] + [(ring, True) for ring in rings]:
+                # closed loop - with the first vertex at the end
+                indices = vertices + vertices[:1] if closed else vertices
+                loop = core.Loop(indices=indices, co=mesh.co[indices])
+                loop_slopes = core.Units.grade_to_mode(grades=core.SlopeAnalysis.loop_grades(loop=loop), mode=mode)
+                loops.append({
+                    'vertices': vertices,
+                    'closed': closed,
+                    'slopes': loop_slopes,
+                    'summary': core.SlopeAnalysis.summary(values=loop_slopes, bins=bins, limit=limit)
+                })
+        stats.lap(phase='solve')
+        if color_layer:
+            mesh.set_vertex_colors(
+                name=color_layer,
+                colors=cls._slope_colors(vertices_count=len(mesh.co), edges=edges, slopes=slopes, limit=limit)
+            )
+            stats.lap(phase='mesh_write')
+        mesh.free()
+        stats.count(counter='loops', value=len(loops))
+        return {'edges': edges, 'slopes': slopes, 'summary': summary, 'loops': loops}
+
+    @staticmethod
+    def _slope_colors(vertices_count, edges, slopes, limit):
+        # (V, 3) colors of vertices by the max slope of their edges from green (0) to red (limit)
+        #   vertices without edges are grey
+        vertices_slopes = np.full(vertices_count, -1.0)
+        np.maximum.at(vertices_slopes, edges[:, 0], slopes)
+        np.maximum.at(vertices_slopes, edges[:, 1], slopes)
+        factor = np.clip(vertices_slopes / limit, 0.0, 1.0)
+        colors = np.column_stack((factor, 1.0 - factor, np.zeros(vertices_count)))
+        colors[vertices_slopes < 0.0] = 0.5
+        return colors
+
+    @staticmethod
+    def _export_analysis(result, mode, path):
+        # save analysis result to .csv (slope of each edge) or .json (summaries and slopes of edges and loops) file
+        if path.lower().endswith('.csv'):
+            with open(path, 'w') as output:
+                output.write('object,vertex_1,vertex_2,slope_' + mode.lower() + '\n')
+                for name, ob_result in result.items():
+                    for (v1, v2), slope in zip(ob_result['edges'].tolist(), ob_result['slopes'].tolist()):
+                        output.write('"' + name.replace('"', '""') + '",' + str(v1) + ',' + str(v2) + ','
+                                     + repr(slope) + '\n')
+        else:
+            with open(path, 'w') as output:
+                json.dump({
+                    'mode': mode,
+                    'objects': {name: {
+                        'summary': ob_result['summary'],
+                        'edges': ob_result['edges'].tolist(),
+                        'slopes': [slope if math.isfinite(slope) else None for slope in ob_result['slopes'].tolist()],
+                        'loops': [{
+                            'vertices': list(loop['vertices']),
+                            'closed': loop['closed'],
+                            'slopes': [slope if math.isfinite(slope) else None for slope in loop['slopes'].tolist()],
+                            'summary': loop['summary']
+                        } for loop in ob_result['loops']]
+                    } for name, ob_result in result.items()}
+                }, output, indent=4)
+
+    @classmethod
+    def _align_neighbour(cls, context, ob, depth=1, falloff='CONSTANT', stats=DisabledStats):
+        # align neighbour vertices of selected loop
+        #   depth - number of rings of neighbour vertices from the loop
+        #   falloff - one of core.Neighbours.falloffs, how the loop height influence decreases with rings
+        stats.lap()
+        # get data loop from source mesh
+        mesh = cls._mesh_io(ob=ob)
+        stats.lap(phase='mesh_read')
+        cls._count_mesh(mesh=mesh, stats=stats)
+        # source vertices - selected, exclude first and last
+        selected_links = np.bincount(mesh.selected_edges().ravel(), minlength=len(mesh.co))
+        sources = np.flatnonzero(mesh.select & (selected_links > 1))
+        # neighbours - by rings from the source vertices, don't move selected and hidden vertices
+        neighbours, heights = core.Neighbours.align(
+            heights=mesh.co[:, 2],
+            edges=mesh.edges,
+            sources=sources,
+            locked=mesh.select | mesh.hide,
+            depth=depth,
+            falloff=falloff
+        )
+        if neighbours.size:
+            mesh.set_heights(indices=neighbours, heights=heights)
+            stats.lap(phase='solve')
+            # save changed data to mesh
+            mesh.write()
+            stats.lap(phase='mesh_write')
+        mesh.free()
+        stats.count(counter='aligned_vertices', value=len(neighbours))
+        return len(neighbours)
+
+    @classmethod
+    def _objects_with_selection(cls, context, objects):
+        # mesh objects which have selected vertices, active object if no objects passed
+        #   linked duplicates share the mesh - only the first object of each mesh, the mesh is changed once
+        objects = objects if objects else [context.active_object]
+        meshes = set()
+        result = []
+        for ob in objects:
+            if ob and ob.type == 'MESH' and ob.data.as_pointer() not in meshes and cls._has_selection(ob=ob):
+                meshes.add(ob.data.as_pointer())
+                result.append(ob)
+        return result
+
+    @staticmethod
+    def _has_selection(ob):
+        # cheap check for selected vertices before reading the mesh data
+        if ob.mode == 'EDIT':
+            return ob.data.total_vert_sel > 0
+        else:
+            return MeshIO.has_selection(mesh=ob.data)
+
+    @classmethod
+    def _make_slope_ordering(cls, mesh, selected_edges, select_mode):
+        # sorted vertices loop starting from active vertex
+        #   returns core.Loop, distances from active vertex, number of branching vertices
+        #   and number of selected vertices not connected with active vertex
+        #   simple loop from active vertex - Loop with geometry (without it for solving by blocks), distances - None
+        #   network of paths - Loop with vertices indices only (active vertex is the first) and distances
+        # selected edges adjacency index
+        adjacency = core.LoopsSorter.adjacency(edges=selected_edges.tolist())
+        # find active vertex
+        active_vertex = cls._active_vertex(
+            active=mesh.active,
+            select_mode=select_mode,
+            adjacency=adjacency
+        )
+        if active_vertex is None:
+            return None, None, 0, 0
+        # split selection to paths between end, branching and active vertices
+        paths, rings = core.LoopsSorter.paths(adjacency=adjacency, nodes=(active_vertex, ))
+        junctions = len(core.LoopsSorter.branches(adjacency=adjacency))
+        active_paths = [path if path[0] == active_vertex else path[::-1] for path in paths
+                        if active_vertex in (path[0], path[-1])]
+        if len(active_paths) == 1 and len(adjacency[active_paths[0][-1]]) == 1:
+            # simple loop from active vertex to the end, the path is walked from active vertex
+            loop = cls._loop(mesh=mesh, indices=active_paths[0])
+            return loop, None, junctions, len(adjacency) - len(loop)
+        vertices, distances = core.Network.distances(co=mesh.co, paths=paths, root=active_vertex)
+        return core.Loop(indices=vertices), distances, junctions, len(adjacency) - len(vertices)
+
+    @classmethod
+    def _last_ordering(cls, mesh, selected_edges, last):
+        # simple loop of the selection by the last solved loop of the object and the first vertex changed since then
+        #   last - (active element, core.Loop with solved coordinates)
+        #   the selection should be the last loop or the last loop extended from its end, with the same active element
+        #   vertices are compared with the solved coordinates in mesh precision (float32)
+        #   returns ordering as _make_slope_ordering and the first changed vertex, (None, 0) - to order the selection
+        active, solved = last
+        indices = cls._extended_loop(mesh=mesh, selected_edges=selected_edges, loop=solved.indices) \
+            if mesh.active == active else None
+        if indices is None or (cls._block_size and len(indices) > cls._block_size):
+            return None, 0
+        co = mesh.co[indices]
+        first = core.Polyline.first_changed(co=co.astype(np.float32), previous=solved.co.astype(np.float32))
+        return (solved.rebase(indices=indices, co=co, first=first), None, 0, 0), first
+
+    @staticmethod
+    def _extended_loop(mesh, selected_edges, loop):
+        # vertices indices of the selection if it is the loop or the loop extended by a path from its end vertex
+        #   None - for any other selection
+        selected_count = mesh.selected_vertices().size
+        if len(selected_edges) != selected_count - 1 or not mesh.select[loop].all():
+            return None
+        # selected edges and the loop edges by (lower vertex index, upper vertex index) keys
+        vertices_count = len(mesh.co)
+        keys = selected_edges.min(axis=1).astype(np.int64) * vertices_count + selected_edges.max(axis=1)
+        loop_keys = np.minimum(loop[:-1], loop[1:]) * vertices_count + np.maximum(loop[:-1], loop[1:])
+        if not np.isin(loop_keys, keys).all():
+            return None
+        if selected_count == len(loop):
+            return loop
+        # extension - one path from the loop end vertex through not loop vertices
+        adjacency = core.LoopsSorter.adjacency(edges=selected_edges[~np.isin(keys, loop_keys)].tolist())
+        paths, rings = core.LoopsSorter.paths(adjacency=adjacency, nodes=(loop[-1], ))
+        if len(paths) != 1 or rings or loop[-1] not in (paths[0][0], paths[0][-1]):
+            return None
+        path = paths[0] if paths[0][0] == loop[-1] else paths[0][::-1]
+        if len(loop) + len(path) - 1 != selected_count or np.isin(path[1:], loop).any():
+            return None
+        return np.concatenate((loop, path[1:]))
+
+    @classmethod
+    def _q_slope_ordering(cls, mesh):
+        # selected loops with more than 2 vertices - paths between end and branching vertices
+        #   returns list of core.Loop, branching vertices indices and number of skipped closed loops
+        #   closed loops - without branching vertices or through one branching vertex (path starts and ends on it)
+        adjacency = core.LoopsSorter.adjacency(edges=mesh.selected_edges().tolist())
+        paths, rings = core.LoopsSorter.paths(adjacency=adjacency)
+        cycles = [path for path in paths if path[0] == path[-1]]
+        # remove loops with just 1 or 2 vertices
+        loops = [cls._loop(mesh=mesh, indices=path) for path in paths if len(path) > 2 and path[0] != path[-1]]
+        return loops, np.array(core.LoopsSorter.branches(adjacency=adjacency), dtype=int), len(rings) + len(cycles)
+
+    @classmethod
+    def _loop(cls, mesh, indices):
+        # core.Loop with coordinates and XY geometry of the vertices
+        #   without geometry for the loops which are solved by blocks
+        if cls._block_size and len(indices) > cls._block_size:
+            return core.Loop(indices=indices)
+        return core.Loop(indices=indices, co=mesh.co[indices])
+
+    @staticmethod
+    def _loop_stream(mesh, loop):
+        # read / write functions for solving the loop by blocks
+
+        def read(start, stop):
+            return mesh.co[loop[start:stop]]
+
+        def write(start, stop, heights):
+            mesh.set_heights(indices=loop[start:stop], heights=heights)
+
+        return read, write
+
+    @staticmethod
+    def _count_mesh(mesh, stats):
+        # count processed mesh data
+        stats.count(counter='objects')
+        stats.count(counter='vertices', value=len(mesh.co))
+        stats.count(counter='edges', value=len(mesh.edges))
+
+    @staticmethod
+    def _mesh_io(ob, select_history=False):
+        # get mesh data of the object
+        #   in EDIT mode - work with edit mesh in place, in OBJECT mode - bulk access to mesh,
+        #   bmesh copy only if select history is needed
+        if ob.mode == 'EDIT':
+            return EditBMeshIO(mesh=ob.data)
+        elif select_history:
+            return BMeshIO(mesh=ob.data)
+        else:
+            return MeshIO(mesh=ob.data)
+
+    @staticmethod
+    def _active_vertex(active, select_mode, adjacency):
+        # get active vertex index by the active element of select history
+        active_vertex = None
+        if active:
+            if select_mode == 'VERT' and len(active) == 1:
+                # active vertex
+                active_vertex = active[0]
+            elif select_mode == 'EDGE' and len(active) == 2:
+                # start vertex of active edge
+                active_vertex = active[0] if len(adjacency.get(active[0], [])) == 1 else active[1]
+        return active_vertex
+
+    @staticmethod
+    def ui(layout, context):
+        # ui panel
+        op = layout.operator(
+            operator='slope_loop.make_slope',
+            icon='IPO'
+        )
+        op.mode = context.scene.slope_loop_prop_mode
+        op.value = context.scene.slope_loop_prop_value
+        # props
+        row = layout.row()
+        row.prop(
+            data=context.scene,
+            property='slope_loop_prop_mode',
+            expand=True
+        )
+        layout.prop(
+            data=context.scene,
+            property='slope_loop_prop_value',
+            text=''
+        )
+        layout.operator(
+            operator='slope_loop.align_neighbour',
+            icon='GRIP'
+        )
+        layout.operator(
+            operator='slope_loop.q_slope',
+            icon='IPO_EASE_IN_OUT'
+        )
+        layout.operator(
+            operator='slope_loop.analyse',
+            icon='VIEWZOOM'
+        )
+        layout.prop(
+            data=context.scene,
+            property='slope_loop_prop_stats'
+        )
+
+    @staticmethod
+    def _report(op, type, message):
+        # report to operator, print if called without operator (headless)
+        if op:
+            op.report(type=type, message=message)
+        else:
+            print(', '.join(sorted(type)) + ': ' + message)
+
+    @staticmethod
+    def _info_network(junctions, op, unreached=0):
+        # print to INFO number of branching vertices in selection and to WARNING number of not processed vertices
+        #   returns number of branching vertices
+        if junctions:
+            SlopeLoop._report(
+                op=op,
+                type={'INFO'},
+                message='Selected loops network with branching vertices: ' + str(junctions)
+            )
+        if unreached:
+            SlopeLoop._report(
+                op=op,
+                type={'WARNING'},
+                message='Selected vertices not connected with active vertex are skipped: ' + str(unreached)
+            )
+        return junctions
+
+    @staticmethod
+    def _info_infeasible(infeasible, heights, loop, mode, op):
+        # print to WARNING number of Loop edges with grade out of the limits and the steepest of them
+        #   returns number of such edges
+        if infeasible.any():
+            grades = np.abs(np.diff(heights)) / np.maximum(loop.lengths, 1e-12)
+            SlopeLoop._report(
+                op=op,
+                type={'WARNING'},
+                message='End height can\'t be reached within grade limits, edges out of limits: '
+                        + str(int(infeasible.sum())) + ', max slope: '
+                        + str(round(core.Units.slope_to_mode(
+                            radians=math.atan(grades[infeasible].max()),
+                            mode=mode
+                        ), 4)) + ' ' + mode
+            )
+        return int(infeasible.sum())
+
+    @classmethod
+    def _info_angle_between_two_vertices(cls, co1, co2, mode, op):
+        # print to INFO angle between two vertices
+        edge_slope = core.SlopeSolver.slope(
+            co1=co1,
+            co2=co2
+        )
+        cls._report(
+            op=op,
+            type={'INFO'},
+            message='Active edge angle: '
+                    + str(round(core.Units.slope_to_mode(radians=edge_slope, mode=mode), 4))
+                    + ' ' + mode
+        )
+
+
+# OPERATORS
+
+class SlopeLoop_OT_make_slope(Operator):
+    bl_idname = 'slope_loop.make_slope'
+    bl_label = 'Make Slope'
+    bl_description = 'Reshape the selected loop to the desired slope starting from the active vertex'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    value = FloatProperty(
+        name='Value',
+        default=10.0
+    )
+
+    mode = EnumProperty(
+        name='Mode',
+        items=[
+            ('Degrees', 'Degrees', 'Degrees', '', 0),
+            ('Permilles', 'Permilles', 'Permilles', '', 1),
+            ('Percents', 'Percents', 'Percents', '', 2)
+        ],
+        default='Percents',
+        description='Value mode'
+    )
+
+    result_mode = EnumProperty(
+        name='Result',
+        items=[
+            ('EACH_SLOPE', 'Each Slope', 'Each edge of the loop has the desired slope value', '', 0),
+            ('FULL_SLOPE', 'Full Slope', 'Each vertex has the desired slope value to the active vertex', '', 1),
+            ('TARGET_SLOPE', 'Target Elevation', 'From start to end height within grade limits', '', 2)
+        ],
+        default='EACH_SLOPE',
+        description='Slope result mode'
+    )
+
+    start_height = FloatProperty(
+        name='Start Height',
+        description='Target Elevation: height of the active vertex, the current one if not changed',
+        default=0.0,
+        subtype='DISTANCE'
+    )
+
+    end_height = FloatProperty(
+        name='End Height',
+        description='Target Elevation: height of the last vertex of the loop, the current one if not changed',
+        default=0.0,
+        subtype='DISTANCE'
+    )
+
+    min_grade = FloatProperty(
+        name='Min Grade',
+        description='Target Elevation: minimal slope of each edge, in value mode',
+        default=-10.0
+    )
+
+    max_grade = FloatProperty(
+        name='Max Grade',
+        description='Target Elevation: maximal slope of each edge, in value mode',
+        default=10.0
+    )
+
+    def execute(self, context):
+        SlopeLoop.make_slope_loop(
+            context=context,
+            objects=SlopeLoop.context_objects(context=context),
+            slope_mode=self.mode,
+            value=self.value,
+            op=self,
+            result_mode=self.result_mode,
+            target={
+                'start': self.start_height if self.properties.is_property_set('start_height') else None,
+                'end': self.end_height if self.properties.is_property_set('end_height') else None,
+                'min_grade': self.min_grade,
+                'max_grade': self.max_grade
+            }
+        )
+        return {'FINISHED'}
+
+
+class SlopeLoop_OT_q_slope(Operator):
+    bl_idname = 'slope_loop.q_slope'
+    bl_label = 'QSlope'
+    bl_description = 'QSlope'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        SlopeLoop.q_slope_loop(
+            context=context,
+            objects=SlopeLoop.context_objects(context=context),
+            op=self
+        )
+        return {'FINISHED'}
+
+
+class SlopeLoop_OT_align_neighbour(Operator):
+    bl_idname = 'slope_loop.align_neighbour'
+    bl_label = 'Align Neighbour'
+    bl_description = 'Inherit the height of vertices directly connected to the interior of the selected loop.'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    depth = IntProperty(
+        name='Depth',
+        description='Number of rings of neighbour vertices',
+        default=1,
+        min=1
+    )
+
+    falloff = EnumProperty(
+        name='Falloff',
+        items=[
+            ('CONSTANT', 'Constant', 'All rings get the loop height', '', 0),
+            ('LINEAR', 'Linear', 'Loop height influence decreases linearly with rings', '', 1),
+            ('SMOOTH', 'Smooth', 'Loop height influence decreases smoothly with rings', '', 2)
+        ],
+        default='CONSTANT',
+        description='How the loop height influence decreases with rings'
+    )
+
+    def execute(self, context):
+        SlopeLoop.align_neighbour(
+            context=context,
+            objects=SlopeLoop.context_objects(context=context),
+            op=self,
+            depth=self.depth,
+            falloff=self.falloff
+        )
+        return {'FINISHED'}
+
+
+class SlopeLoop_OT_analyse(Operator):
+    bl_idname = 'slope_loop.analyse'
+    bl_label = 'Slope Analysis'
+    bl_description = 'Report slope statistics of selected loops or all mesh edges without changing the mesh'
+    # without UNDO - read-only, redo panel changes don't re-execute it (and don't rewrite the export file)
+    bl_options = {'REGISTER'}
+
+    scope = EnumProperty(
+        name='Scope',
+        items=[
+            ('SELECTED', 'Selected', 'Each selected loop and all selected edges', '', 0),
+            ('MESH', 'Mesh', 'All mesh edges', '', 1)
+        ],
+        default='SELECTED',
+        description='Edges to analyse'
+    )
+
+    bins = IntProperty(
+        name='Bins',
+        description='Number of histogram bins',
+        default=10,
+        min=1
+    )
+
+    limit = FloatProperty(
+        name='Limit',
+        description='Histogram upper bound and slope of full red color, in value mode. 0 - max slope',
+        default=0.0,
+        min=0.0
+    )
+
+    filepath = StringProperty(
+        name='Export',
+        description='Export slopes to .csv or .json file, nothing is exported if empty',
+        default='',
+        subtype='FILE_PATH'
+    )
+
+    color_layer = StringProperty(
+        name='Color Layer',
+        description='Paint vertices by slope to this vertex colors layer, nothing is painted if empty',
+        default=''
+    )
+
+    def execute(self, context):
+        SlopeLoop.analyse(
+            context=context,
+            objects=SlopeLoop.context_objects(context=context),
+            scope=self.scope,
+            bins=self.bins,
+            limit=self.limit,
+            output=bpy.path.abspath(self.filepath) if self.filepath else None,
+            color_layer=self.color_layer or None,
+            op=self
+        )
+        if self.color_layer:
+            # only vertex colors are changed - undo step for them
+            bpy.ops.ed.undo_push(message=self.bl_label)
+        return {'FINISHED'}
+
+
+# PANELS
+
+class SlopeLoop_PT_panel(Panel):
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    bl_label = "Slope Loop"
+    bl_category = '1D'
+
+    def draw(self, context):
+        SlopeLoop.ui(
+            layout=self.layout,
+            context=context
+        )
+
+
+# REGISTER
+
+def register(ui=None):
+    # ui - register the panel, by default only with Blender UI (not in background mode)
+    #   solver modules (numpy, bmesh, core) are loaded on the first operator execution
+    ui = not bpy.app.background if ui is None else ui
+    Scene.slope_loop_prop_value = FloatProperty(
+        name='Value',
+        default=10
+    )
+    Scene.slope_loop_prop_mode = EnumProperty(
+        name='Mode',
+        items=[
+            ('Degrees', 'Degrees', 'Degrees', '', 0),
+            ('Permilles', 'Permilles', 'Permilles', '', 1),
+            ('Percents', 'Percents', 'Percents', '', 2)
+        ],
+        default='Percents',
+        description='Value mode'
+    )
+    Scene.slope_loop_prop_stats = BoolProperty(
+        name='Stats',
+        description='Report time of each phase and processed data counters',
+        default=False
+    )
+    Scene.slope_loop_prop_stats_last = StringProperty(
+        name='Last Stats',
+        description='Stats of the last operation (json)',
+        default=''
+    )
+    register_class(SlopeLoop_OT_make_slope)
+    register_class(SlopeLoop_OT_q_slope)
+    register_class(SlopeLoop_OT_align_neighbour)
+    register_class(SlopeLoop_OT_analyse)
+    if ui:
+        register_class(SlopeLoop_PT_panel)
+
+
+def unregister(ui=None):
+    # ui - unregister the panel, by default if it was registered
+    ui = SlopeLoop_PT_panel.is_registered if ui is None else ui
+    LoopsCache.clear()
+    LastSolveCache.clear()
+    if ui:
+        unregister_class(SlopeLoop_PT_panel)
+    unregister_class(SlopeLoop_OT_analyse)
+    unregister_class(SlopeLoop_OT_align_neighbour)
+    unregister_class(SlopeLoop_OT_q_slope)
+    unregister_class(SlopeLoop_OT_make_slope)
+    del Scene.slope_loop_prop_stats_last
+    del Scene.slope_loop_prop_stats
+    del Scene.slope_loop_prop_mode
+    del Scene.slope_loop_prop_value
+
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,211 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Batch processing of .blend files with Slope Loop in headless Blender workers
+#
+#   Run from the command line (driver):
+#       python -m slope_loop.batch --blender /path/to/blender --operation make_slope --mode Percents --value 10
+#           --workers 8 --save --output summary.json file_1.blend file_2.blend ...
+#   Each file is processed by a separate worker:
+#       blender -b file_1.blend --python slope_loop/batch.py -- --worker --operation make_slope ...
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# worker prints its summary to stdout in a line starting with this marker
+SUMMARY_MARKER = 'SLOPE_LOOP_SUMMARY '
+
+OPERATIONS = ('make_slope', 'q_slope', 'align_neighbour')
+MODES = ('Degrees', 'Permilles', 'Percents')
+FALLOFFS = ('CONSTANT', 'LINEAR', 'SMOOTH')
+ROUNDINGS = ('LEGACY', 'EXACT')
+
+
+# DRIVER
+
+def run_batch(files, blender, operation, mode, value, workers, objects=None, save=False, depth=1,
+              falloff='CONSTANT', block_size=0, rounding='LEGACY'):
+    # process files in pool of headless blender workers, returns list of summaries for each file
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        return list(executor.map(
+            lambda file_path: _run_worker(
+                file_path=file_path,
+                blender=blender,
+                operation=operation,
+                mode=mode,
+                value=value,
+                objects=objects,
+                save=save,
+                depth=depth,
+                falloff=falloff,
+                block_size=block_size,
+                rounding=rounding
+            ),
+            files
+        ))
+
+
+def _run_worker(file_path, blender, operation, mode, value, objects, save, depth, falloff, block_size, rounding):
+    # process one file in separate headless blender process
+    command = [
+        blender, '-b', file_path, '--factory-startup',
+        '--python', os.path.abspath(__file__),
+        '--', '--worker', '--operation', operation, '--mode', mode, '--value', str(value),
+        '--depth', str(depth), '--falloff', falloff, '--block-size', str(block_size),
+        '--rounding', rounding
+    ]
+    if objects:
+        command += ['--objects'] + list(objects)
+    if save:
+        command.append('--save')
+    start = time.time()
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    summary = next((json.loads(line[len(SUMMARY_MARKER):]) for line in process.stdout.splitlines()
+                    if line.startswith(SUMMARY_MARKER)), None)
+    if summary is None:
+        summary = {
+            'file': file_path,
+            'error': process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'no summary from worker'
+        }
+    summary['returncode'] = process.returncode
+    summary['time'] = round(time.time() - start, 3)
+    return summary
+
+
+# WORKER
+
+def run_worker(operation, mode, value, objects=None, save=False, depth=1, falloff='CONSTANT', block_size=0,
+               rounding='LEGACY'):
+    # process objects of the currently opened .blend file, runs inside blender
+    import bpy
+    # the package of this script, not the installed add-on
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import slope_loop
+    from slope_loop import addon, core
+    slope_loop.register(ui=False)
+    addon.SlopeLoop._block_size = block_size
+    core.Units.rounding = rounding
+    # files are processed by parallel workers - solve loops sequentially in each of them
+    addon.SlopeLoop._workers = 1
+    context = bpy.context
+    context.scene.slope_loop_prop_mode = mode
+    context.scene.slope_loop_prop_value = value
+    objects = [bpy.data.objects[name] for name in objects if name in bpy.data.objects] if objects \
+        else [ob for ob in context.scene.objects if ob.type == 'MESH']
+    summary = {
+        'file': bpy.data.filepath,
+        'operation': operation,
+        'mode': mode,
+        'value': value,
+        'objects': {}
+    }
+    if operation == 'make_slope':
+        result = addon.SlopeLoop.make_slope_loop(
+            context=context,
+            objects=objects,
+            slope_mode=mode,
+            value=value,
+            op=None
+        )
+        summary['objects'] = {name: {'loops': loops} for name, loops in result.items()}
+    elif operation == 'q_slope':
+        result = addon.SlopeLoop.q_slope_loop(
+            context=context,
+            objects=objects,
+            op=None
+        )
+        summary['objects'] = {name: {
+            'loops': len(angles),
+            'angles': [round(core.Units.slope_to_mode(radians=radians, mode=mode), 4)
+                       for radians in angles]
+        } for name, angles in result.items()}
+    elif operation == 'align_neighbour':
+        result = addon.SlopeLoop.align_neighbour(
+            context=context,
+            objects=objects,
+            depth=depth,
+            falloff=falloff
+        )
+        summary['objects'] = {name: {'vertices': vertices} for name, vertices in result.items()}
+    summary['loops'] = sum(ob_summary.get('loops', 0) for ob_summary in summary['objects'].values())
+    if save:
+        bpy.ops.wm.save_mainfile()
+    slope_loop.unregister(ui=False)
+    print(SUMMARY_MARKER + json.dumps(summary))
+    return summary
+
+
+# COMMAND LINE
+
+def _arguments(argv):
+    parser = argparse.ArgumentParser(description='Batch processing of .blend files with Slope Loop')
+    parser.add_argument('files', nargs='*', help='.blend files to process')
+    parser.add_argument('--worker', action='store_true', help='process currently opened file (inside blender)')
+    parser.add_argument('--blender', default='blender', help='path to blender executable')
+    parser.add_argument('--operation', choices=OPERATIONS, default='make_slope')
+    parser.add_argument('--mode', choices=MODES, default='Percents', help='slope value mode')
+    parser.add_argument('--value', type=float, default=10.0, help='slope value for make_slope')
+    parser.add_argument('--objects', nargs='*', help='object names, all mesh objects if not set')
+    parser.add_argument('--depth', type=int, default=1, help='rings of neighbour vertices for align_neighbour')
+    parser.add_argument('--falloff', choices=FALLOFFS, default='CONSTANT', help='falloff for align_neighbour')
+    parser.add_argument('--block-size', type=int, default=0,
+                        help='solve loops longer than this by blocks to limit memory, 0 - whole loops')
+    parser.add_argument('--rounding', choices=ROUNDINGS, default='LEGACY',
+                        help='slope angles rounding, LEGACY - to 4 digits as in the add-on, EXACT - not rounded')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='number of blender processes')
+    parser.add_argument('--save', action='store_true', help='save processed files')
+    parser.add_argument('--output', help='save summary to json file')
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = _arguments(argv=argv)
+    if args.worker:
+        run_worker(
+            operation=args.operation,
+            mode=args.mode,
+            value=args.value,
+            objects=args.objects,
+            save=args.save,
+            depth=args.depth,
+            falloff=args.falloff,
+            block_size=args.block_size,
+            rounding=args.rounding
+        )
+        return 0
+    summaries = run_batch(
+        files=args.files,
+        blender=args.blender,
+        operation=args.operation,
+        mode=args.mode,
+        value=args.value,
+        workers=args.workers,
+        objects=args.objects,
+        save=args.save,
+        depth=args.depth,
+        falloff=args.falloff,
+        block_size=args.block_size,
+        rounding=args.rounding
+    )
+    for summary in summaries:
+        print(summary['file'] + ': '
+              + (summary['error'] if 'error' in summary
+                 else str(summary['loops']) + ' loops in ' + str(len(summary['objects'])) + ' objects')
+              + ' (' + str(summary['time']) + ' s)')
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(summaries, output, indent=4)
+    return 0 if all('error' not in summary and summary['returncode'] == 0 for summary in summaries) else 1
+
+
+if __name__ == '__main__':
+    # inside blender script arguments go after '--'
+    sys.exit(main(argv=sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else sys.argv[1:]))
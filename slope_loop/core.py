@@ -0,0 +1,710 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Slope Loop core - slope math over plain coordinates arrays and edges lists, doesn't need Blender
+#   used by the add-on operators and can be used standalone, for example for polyline from CSV:
+#       co = np.loadtxt('contour.csv', delimiter=',')
+#       co[:, 2] = Polyline.make_slope(co=co, value=10.0, mode='Percents')
+
+import heapq
+import math
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+# LOOPS SORTER
+
+class LoopsSorter:
+
+    # Orders selected vertices into loops by selected edges adjacency index
+    #   index is built once, all walks are linear from vertices and edges count
+
+    @staticmethod
+    def adjacency(edges):
+        # get adjacency index {vertex_index: [linked_vertex_index, ...]} from selected edges vertices indices pairs
+        adjacency = {}
+        for v1, v2 in edges:
+            adjacency.setdefault(v1, []).append(v2)
+            adjacency.setdefault(v2, []).append(v1)
+        return adjacency
+
+    @staticmethod
+    def branches(adjacency):
+        # get vertices with more than two selected linked edges
+        return [vertex for vertex, linked in adjacency.items() if len(linked) > 2]
+
+    @staticmethod
+    def paths(adjacency, nodes=()):
+        # split adjacency index to paths between nodes - end vertices, branching vertices and passed nodes
+        #   each path starts and ends on nodes, inner vertices have two linked vertices
+        #   path through a cycle starts and ends on the same node
+        #   rings - closed loops without nodes, each ring ends with the vertex linked to its first vertex
+        #   each edge is walked once
+        nodes = set(nodes)
+        nodes.update(vertex for vertex, linked in adjacency.items() if len(linked) != 2)
+        walked = set()
+        paths = []
+        rings = []
+
+        def walk(vertex, linked):
+            # vertices from vertex through linked to the next node (or back to vertex for rings)
+            path = [vertex]
+            while linked is not None:
+                walked.add((min(vertex, linked), max(vertex, linked)))
+                path.append(linked)
+                if linked in nodes or linked == path[0]:
+                    break
+                vertex, linked = linked, next((next_vertex for next_vertex in adjacency[linked]
+                                              if (min(linked, next_vertex), max(linked, next_vertex)) not in walked), None)
+            return path
+
+        for node in (vertex for vertex in adjacency if vertex in nodes):
+            for linked in adjacency[node]:
+                if (min(node, linked), max(node, linked)) not in walked:
+                    paths.append(walk(vertex=node, linked=linked))
+        for vertex, linked in adjacency.items():
+            if (min(vertex, linked[0]), max(vertex, linked[0])) not in walked:
+                rings.append(walk(vertex=vertex, linked=linked[0])[:-1])
+        return paths, rings
+
+
+# LOOP
+
+class Loop:
+
+    # Ordered loop of vertices with its XY geometry in contiguous arrays, built once and passed to all solvers
+    #   indices - vertices indices, co - (N, 3) coordinates, z - original heights (view of co),
+    #   lengths - XY segments lengths, distances - cumulative XY distances from the first vertex
+    #   without coordinates (co=None) only indices are set - for the loops solved by blocks
+
+    __slots__ = ('indices', 'co', 'z', 'lengths', 'distances')
+
+    def __init__(self, indices, co=None):
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.co = co
+        if co is None:
+            self.z = self.lengths = self.distances = None
+        else:
+            self.z = co[:, 2]
+            self.lengths = SlopeSolver.segments_lengths(co=co)
+            self.distances = np.zeros(len(co))
+            np.cumsum(self.lengths, out=self.distances[1:])
+
+    def __len__(self):
+        return len(self.indices)
+
+    def rebase(self, indices, co, first):
+        # Loop of indices and co which are the same as this loop before the first vertex
+        #   XY geometry before the first vertex is reused, from it - counted and the distances cumsum is continued
+        if first == 0:
+            return Loop(indices=indices, co=co)
+        loop = Loop(indices=indices)
+        loop.co = co
+        loop.z = co[:, 2]
+        loop.lengths = np.concatenate((self.lengths[:first - 1], SlopeSolver.segments_lengths(co=co[first - 1:])))
+        loop.distances = np.empty(len(co))
+        loop.distances[:first] = self.distances[:first]
+        np.cumsum(np.concatenate((self.distances[first - 1:first], loop.lengths[first - 1:])),
+                  out=loop.distances[first - 1:])
+        return loop
+
+
+# SLOPE SOLVER
+
+class SlopeSolver:
+
+    # Counts new heights for ordered loop vertices at once
+    #   co - (N, 3) float array with coordinates of the loop vertices in loop order
+    #   lengths - precomputed segments_lengths(co), counted if not passed
+    #   distances - precomputed cumulative XY distances from the first vertex (Loop.distances), used instead of lengths
+    #   grade - height difference / XY length, resolved once for the whole loop (Units.grade)
+
+    @staticmethod
+    def segments_lengths(co):
+        # lengths of the loop segments projections on XY plane
+        return np.hypot(np.diff(co[:, 0]), np.diff(co[:, 1]))
+
+    @classmethod
+    def each_slope(cls, co, grade, direction=1.0, lengths=None, distances=None):
+        # heights where each edge of the loop has the desired slope, the first vertex stays on its place
+        if distances is not None:
+            # one multiply for each vertex
+            return co[0, 2] + distances * (direction * grade)
+        lengths = cls.segments_lengths(co=co) if lengths is None else lengths
+        heights = np.empty(len(co))
+        heights[0] = co[0, 2]
+        heights[1:] = co[0, 2] + np.cumsum(lengths * (direction * grade))
+        return heights
+
+    @staticmethod
+    def full_slope(co, grade):
+        # heights where each vertex has the desired slope to the first vertex of the loop
+        lengths = np.hypot(co[:, 0] - co[0, 0], co[:, 1] - co[0, 1])
+        heights = co[0, 2] + lengths * grade
+        heights[0] = co[0, 2]
+        return heights
+
+    @classmethod
+    def q_slope(cls, co, lengths=None, distances=None):
+        # heights where all loop has the same slope from the first vertex to the last
+        #   the first vertex should be upper than the last
+        #   returns heights and angle in radians
+        # get loop length
+        #   calculating with real length - not valid. Why???
+        #   better way - calculating through projection on XY plane (Paul)
+        if distances is not None:
+            loop_proj_length = distances[-1]
+        else:
+            lengths = cls.segments_lengths(co=co) if lengths is None else lengths
+            loop_proj_length = lengths.sum()
+        # vertical diff between first and last vertices
+        diff = co[0, 2] - co[-1, 2]
+        radians = cls.q_slope_angle(diff=diff, loop_proj_length=loop_proj_length)
+        # "-" because we always go from top to bottom
+        return cls.each_slope(co=co, grade=Units.radians_to_grade(radians=radians), direction=-1.0,
+                              lengths=lengths, distances=distances), radians
+
+    @classmethod
+    def target_slope(cls, co, start, end, min_grade, max_grade, lengths=None):
+        # heights from start to end height, each edge grade (height difference / XY length) within the limits
+        #   follows the current heights where possible - their grades are clamped to the limits
+        #   and the rest of the height difference is distributed by the edges slack to the limits
+        #   if the end height can't be reached within the limits, the rest is distributed by edges lengths
+        #   returns heights and mask of infeasible edges - with grade out of the limits
+        lengths = cls.segments_lengths(co=co) if lengths is None else lengths
+        low = min_grade * lengths
+        high = max_grade * lengths
+        diffs = np.clip(np.diff(co[:, 2]), low, high)
+        residual = end - start - diffs.sum()
+        slack = high - diffs if residual > 0.0 else diffs - low
+        slack_total = slack.sum()
+        if slack_total > 0.0:
+            share = math.copysign(min(abs(residual) / slack_total, 1.0), residual)
+            diffs += slack * share
+            residual -= slack_total * share
+        if residual:
+            diffs += residual * (lengths / lengths.sum() if lengths.sum() > 0.0 else 1.0 / len(lengths))
+        heights = np.empty(len(co))
+        heights[0] = start
+        heights[1:] = start + np.cumsum(diffs)
+        # tolerance for floating point sums
+        tolerance = 1e-9 * (1.0 + lengths)
+        return heights, (diffs < low - tolerance) | (diffs > high + tolerance)
+
+    @staticmethod
+    def q_slope_angle(diff, loop_proj_length):
+        # get angle by loop_length and diff
+        # maybe error in calculating math.assin ?
+        # radians = round(math.asin(diff / loop_length), 4)
+        # better way - calculating with atan by projection on XY plane
+        #   raises ValueError for the loop without XY length - it has no slope angle
+        if not loop_proj_length > 0.0:
+            raise ValueError('Loop without XY length has no slope angle')
+        return Units.grade_to_radians(grade=diff / loop_proj_length)
+
+    @staticmethod
+    def each_slope_blocks(blocks, grade, direction=1.0):
+        # streaming each_slope
+        #   blocks - iterable of (k, 3) coordinates arrays of the next loop vertices
+        #   yields heights for each block, only the last vertex of the previous block is carried to the next one
+        grade *= direction
+        last_xy = None
+        height = 0.0
+        for co in blocks:
+            if last_xy is None:
+                last_xy, height = co[0, :2], co[0, 2]
+            xy = np.vstack((last_xy, co[:, :2]))
+            heights = height + np.cumsum(np.hypot(np.diff(xy[:, 0]), np.diff(xy[:, 1])) * grade)
+            last_xy, height = co[-1, :2].copy(), heights[-1]
+            yield heights
+
+    @staticmethod
+    def full_slope_blocks(blocks, grade):
+        # streaming full_slope
+        #   blocks - iterable of (k, 3) coordinates arrays of the next loop vertices
+        #   yields heights for each block, only the first vertex of the loop is carried to the next blocks
+        first = None
+        for co in blocks:
+            if first is None:
+                first = co[0].copy()
+            yield first[2] + np.hypot(co[:, 0] - first[0], co[:, 1] - first[1]) * grade
+
+    @staticmethod
+    def length_blocks(blocks):
+        # loop projection on XY plane length by blocks of coordinates of the next loop vertices
+        length = 0.0
+        last_xy = None
+        for co in blocks:
+            xy = co[:, :2] if last_xy is None else np.vstack((last_xy, co[:, :2]))
+            length += np.hypot(np.diff(xy[:, 0]), np.diff(xy[:, 1])).sum()
+            last_xy = co[-1, :2].copy()
+        return length
+
+    @staticmethod
+    def slope(co1, co2):
+        # get slope angle by two vertices coordinates in radians
+        #   angle between vector from v2 to v1 and its projection on XY plane
+        return math.atan2(abs(co1[2] - co2[2]), math.hypot(co1[0] - co2[0], co1[1] - co2[1]))
+
+
+# NEIGHBOURS
+
+class MeshAdjacency:
+
+    # Adjacency index of all mesh edges in compressed form
+    #   linked vertices of the vertex i are linked[offsets[i]:offsets[i + 1]]
+
+    def __init__(self, edges, vertices_count):
+        edges = np.asarray(edges).reshape(-1, 2)
+        directed = np.concatenate((edges, edges[:, ::-1]))
+        self.linked = directed[np.argsort(directed[:, 0], kind='stable'), 1]
+        self.offsets = np.zeros(vertices_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(directed[:, 0], minlength=vertices_count), out=self.offsets[1:])
+
+    def links(self, vertices):
+        # pairs (vertex, linked vertex) for all linked vertices of the vertices
+        #   returns two arrays - vertices and linked vertices
+        starts = self.offsets[vertices]
+        counts = self.offsets[vertices + 1] - starts
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return np.repeat(vertices, counts), self.linked[positions]
+
+
+class Neighbours:
+
+    # Propagate heights of the source vertices to the neighbour vertices ring by ring (breadth-first)
+
+    falloffs = ('CONSTANT', 'LINEAR', 'SMOOTH')
+
+    @classmethod
+    def align(cls, heights, edges, sources, locked, depth=1, falloff='CONSTANT'):
+        # heights - (V, ) Z coordinates of all vertices
+        # edges - (E, 2) vertices indices of all edges
+        # sources - indices of the vertices which heights are propagated
+        # locked - (V, ) bool, vertices which are not moved and not passed through (selected, hidden)
+        #   vertex gets the height from the nearest ring, if it is linked to several vertices of the previous ring
+        #   (touches two loops) - the mean of their heights
+        #   returns indices of moved vertices and their new heights
+        sources = np.asarray(sources, dtype=np.int64)
+        adjacency = MeshAdjacency(edges=edges, vertices_count=len(heights))
+        visited = np.array(locked, dtype=bool)
+        visited[sources] = True
+        carried = np.array(heights, dtype=np.float64)
+        frontier = sources
+        moved = []
+        rings = []
+        for ring in range(1, depth + 1):
+            if not frontier.size:
+                break
+            frontier_vertices, linked = adjacency.links(vertices=frontier)
+            not_visited = ~visited[linked]
+            frontier_vertices, linked = frontier_vertices[not_visited], linked[not_visited]
+            frontier, inverse = np.unique(linked, return_inverse=True)
+            carried[frontier] = np.bincount(inverse, weights=carried[frontier_vertices]) / np.bincount(inverse)
+            visited[frontier] = True
+            moved.append(frontier)
+            rings.append(np.full(frontier.size, ring))
+        if not moved:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        moved = np.concatenate(moved)
+        weights = cls.falloff(rings=np.concatenate(rings), depth=depth, falloff=falloff)
+        return moved, heights[moved] + (carried[moved] - heights[moved]) * weights
+
+    @staticmethod
+    def falloff(rings, depth, falloff):
+        # weight of the propagated height for the ring number (1 - nearest to the source)
+        linear = 1.0 - (rings - 1) / float(depth)
+        if falloff == 'LINEAR':
+            return linear
+        elif falloff == 'SMOOTH':
+            return linear * linear * (3.0 - 2.0 * linear)
+        return np.ones(len(rings))
+
+
+# NETWORK
+
+class Network:
+
+    # Slope for the network of paths between nodes (LoopsSorter.paths) from the root node
+    #   co - (V, 3) float array with coordinates of all vertices, paths are lists of its indices
+    #   each vertex gets one height by its shortest distance from the root, so paths meet on nodes with the same height
+
+    @staticmethod
+    def distances(co, paths, root):
+        # shortest distances from the root along the paths (by projections on XY plane)
+        #   returns vertices indices and their distances for all vertices connected with the root, the root is the first
+        # distances along each path and links between nodes
+        cumulative = []
+        links = {}
+        for path in paths:
+            lengths = Loop(indices=path, co=co[path]).distances
+            cumulative.append(lengths)
+            links.setdefault(path[0], []).append((path[-1], lengths[-1]))
+            links.setdefault(path[-1], []).append((path[0], lengths[-1]))
+        # nodes - by nodes graph (Dijkstra)
+        nodes = {root: 0.0}
+        queue = [(0.0, root)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > nodes[node]:
+                continue
+            for linked, length in links.get(node, ()):
+                if distance + length < nodes.get(linked, math.inf):
+                    nodes[linked] = distance + length
+                    heapq.heappush(queue, (distance + length, linked))
+        vertices = [[root], [node for node in nodes if node != root]]
+        distances = [[0.0], [nodes[node] for node in vertices[1]]]
+        # inner vertices of paths - by the nearest path end
+        for path, lengths in zip(paths, cumulative):
+            if path[0] in nodes and len(path) > 2:
+                vertices.append(path[1:-1])
+                distances.append(np.minimum(nodes[path[0]] + lengths, nodes[path[-1]] + lengths[-1] - lengths)[1:-1])
+        return np.concatenate(vertices).astype(int), np.concatenate(distances)
+
+    @staticmethod
+    def make_slope(co, vertices, distances, value, mode, result_mode='EACH_SLOPE'):
+        # heights for the desired slope value from the root (the first of vertices)
+        #   EACH_SLOPE - by distances along the paths, FULL_SLOPE - by straight distances to the root
+        grade = Units.grade(value=value, mode=mode)
+        root = co[vertices[0]]
+        if result_mode == 'FULL_SLOPE':
+            distances = np.hypot(co[vertices, 0] - root[0], co[vertices, 1] - root[1])
+        return root[2] + distances * grade
+
+
+# ANALYSIS
+
+class SlopeAnalysis:
+
+    # Read-only slope statistics of edges
+    #   co - (V, 3) float array with coordinates of all vertices, edges - (E, 2) array of vertices indices
+
+    @staticmethod
+    def grades(co, edges):
+        # grade (absolute height difference / XY length) of each edge, inf for vertical edges, 0 for zero length edges
+        edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        diff = co[edges[:, 1]] - co[edges[:, 0]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grades = np.abs(diff[:, 2]) / np.hypot(diff[:, 0], diff[:, 1])
+        grades[np.isnan(grades)] = 0.0
+        return grades
+
+    @staticmethod
+    def loop_grades(loop):
+        # grade of each edge of the Loop by its precomputed XY lengths
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grades = np.abs(np.diff(loop.z)) / loop.lengths
+        grades[np.isnan(grades)] = 0.0
+        return grades
+
+    @staticmethod
+    def summary(values, bins=10, limit=None):
+        # count, min, max, mean and histogram of values from 0 to limit (max value if not set)
+        #   values over the limit are counted in the last bin
+        #   infinite values (vertical edges) are counted separately and are not included in the rest statistics
+        finite = values[np.isfinite(values)]
+        if not limit:
+            limit = float(finite.max()) if finite.size and finite.max() > 0.0 else 1.0
+        counts, bounds = np.histogram(np.minimum(finite, limit), bins=bins, range=(0.0, limit))
+        return {
+            'count': int(values.size),
+            'infinite': int(values.size - finite.size),
+            'min': float(finite.min()) if finite.size else None,
+            'max': float(finite.max()) if finite.size else None,
+            'mean': float(finite.mean()) if finite.size else None,
+            'histogram': {
+                'counts': counts.tolist(),
+                'bounds': bounds.tolist()
+            }
+        }
+
+
+# UNITS
+
+class SlopeUnit:
+
+    # Slope values conversion for one mode, resolved once by Units.converter() and used for all values of an operation
+    #   scale - mode value for grade 1.0 (1000.0 for permilles, 100.0 for percents), None for degrees
+    #   rounding - Units.roundings policy
+
+    __slots__ = ('scale', 'rounding', '_legacy')
+
+    def __init__(self, scale, rounding):
+        self.scale = scale
+        self.rounding = rounding
+        self._legacy = rounding == 'LEGACY'
+
+    def to_radians(self, value):
+        # convert slope value from mode to radians
+        if self.scale is None:
+            return math.radians(value)
+        radians = math.atan(value / self.scale)
+        return round(radians, 4) if self._legacy else radians
+
+    def from_radians(self, radians):
+        # convert angle from radians to mode
+        if self.scale is None:
+            return math.degrees(radians)
+        tan = math.tan(radians)
+        return (round(tan, 4) if self._legacy else tan) * self.scale
+
+    def to_grade(self, value):
+        # convert slope value from mode to grade - height difference / XY length
+        if self.scale is not None and not self._legacy:
+            return value / self.scale
+        return Units.radians_to_grade(radians=self.to_radians(value=value), rounding=self.rounding)
+
+    def from_grades(self, grades):
+        # convert grades array to mode, not rounded
+        if self.scale is None:
+            return np.degrees(np.arctan(grades))
+        return grades * self.scale
+
+
+class Units:
+
+    # Slope angle conversion between radians and modes (percents, permilles, degrees)
+    #   the mode converter and the grade are resolved once for an operation, solvers only multiply XY lengths by grade
+
+    # mode value for grade 1.0, None - angle in degrees
+    modes = {
+        'Degrees': None,
+        'Permilles': 1000.0,
+        'Percents': 100.0
+    }
+
+    # 'LEGACY' - angles and tangents rounded to 4 digits as in the previous versions
+    # 'EXACT' - without rounding
+    roundings = ('LEGACY', 'EXACT')
+    rounding = 'LEGACY'
+
+    _converters = {}
+
+    @classmethod
+    def converter(cls, mode, rounding=None):
+        # SlopeUnit for the mode, rounding - Units.rounding if not set
+        rounding = rounding if rounding else cls.rounding
+        key = (mode, rounding)
+        if key not in cls._converters:
+            cls._converters[key] = SlopeUnit(scale=cls.modes[mode], rounding=rounding)
+        return cls._converters[key]
+
+    @classmethod
+    def grade(cls, value, mode, rounding=None):
+        # grade (height difference / XY length) for the slope value in mode
+        #   raises ValueError for vertical slope (90 degrees) and not finite values
+        try:
+            grade = cls.converter(mode=mode, rounding=rounding).to_grade(value=value)
+        except ValueError:
+            grade = math.inf
+        if not math.isfinite(grade):
+            raise ValueError('Slope value is vertical or not a number: ' + str(value) + ' ' + mode)
+        return grade
+
+    @classmethod
+    def radians_to_grade(cls, radians, rounding=None):
+        # grade for the angle in radians
+        #   LEGACY - through the rounded tangent of the complementary angle, XY length / tangent = height difference
+        #   raises ValueError for vertical angle
+        if (rounding if rounding else cls.rounding) == 'LEGACY':
+            tan = round(math.tan(math.radians(90) - radians), 4)
+            if not tan:
+                raise ValueError('Vertical slope angle: ' + str(radians))
+            return 1.0 / tan
+        return math.tan(radians)
+
+    @classmethod
+    def grade_to_radians(cls, grade, rounding=None):
+        # angle in radians for the grade
+        radians = math.atan(grade)
+        return round(radians, 4) if (rounding if rounding else cls.rounding) == 'LEGACY' else radians
+
+    @classmethod
+    def slope_to_mode(cls, radians, mode):
+        # convert angle from radians to mode (percents, permilles, degrees)
+        return cls.converter(mode=mode).from_radians(radians=radians)
+
+    @classmethod
+    def mode_to_radians(cls, value, mode):
+        # convert angle from mode (percents, permilles, degrees) to radians
+        return cls.converter(mode=mode).to_radians(value=value)
+
+    @classmethod
+    def mode_to_grade(cls, value, mode):
+        # convert angle from mode (percents, permilles, degrees) to grade - height difference / XY length, not rounded
+        return cls.converter(mode=mode, rounding='EXACT').to_grade(value=value)
+
+    @classmethod
+    def grade_to_mode(cls, grades, mode):
+        # convert grades array (height difference / XY length) to mode (percents, permilles, degrees), not rounded
+        return cls.converter(mode=mode).from_grades(grades=grades)
+
+
+# POLYLINE
+
+class Polyline:
+
+    # Slope for ordered polylines
+    #   co - (N, 3) float array with polyline points coordinates
+
+    # 'FULL_SLOPE' for setting desired slope value from first to last point
+    # 'EACH_SLOPE' for setting desired slope value for each edge of the polyline
+    # 'TARGET_SLOPE' for going from start to end height within grade limits (target_slope)
+    result_modes = ('FULL_SLOPE', 'EACH_SLOPE', 'TARGET_SLOPE')
+
+    # q_slope_loops by the number of cpu cores only for loops with so many vertices in total,
+    #   for less vertices starting the thread pool costs more than it saves
+    threads_min_vertices = 100000
+
+    @staticmethod
+    def make_slope(co, value, mode, result_mode='EACH_SLOPE', lengths=None, distances=None):
+        # heights for the desired slope value starting from the first point
+        grade = Units.grade(value=value, mode=mode)
+        if result_mode == 'FULL_SLOPE':
+            return SlopeSolver.full_slope(co=co, grade=grade)
+        elif result_mode == 'EACH_SLOPE':
+            return SlopeSolver.each_slope(co=co, grade=grade, lengths=lengths, distances=distances)
+
+    @staticmethod
+    def make_slope_tail(co, first, value, mode, result_mode='EACH_SLOPE', distances=None):
+        # make_slope only for the points from the first one, the points before it keep their heights
+        #   distances - cumulative XY distances from the first point (Loop.distances)
+        #   returns heights of the points from the first one
+        if first == 0:
+            return Polyline.make_slope(co=co, value=value, mode=mode, result_mode=result_mode, distances=distances)
+        grade = Units.grade(value=value, mode=mode)
+        if result_mode == 'FULL_SLOPE':
+            return co[0, 2] + np.hypot(co[first:, 0] - co[0, 0], co[first:, 1] - co[0, 1]) * grade
+        elif result_mode == 'EACH_SLOPE':
+            return SlopeSolver.each_slope(co=co, grade=grade, distances=distances[first:])
+
+    @staticmethod
+    def first_changed(co, previous):
+        # index of the first point which differs from the point of the previous polyline
+        #   points over the previous polyline length are changed, len(co) - if no points are changed
+        count = min(len(co), len(previous))
+        changed = np.flatnonzero((co[:count] != previous[:count]).any(axis=1))
+        return int(changed[0]) if changed.size else count
+
+    @staticmethod
+    def target_slope(co, start, end, min_grade, max_grade, mode, lengths=None):
+        # heights from start to end height with grade limits in mode (percents, permilles, degrees)
+        #   returns heights and mask of edges where the limits can't be kept
+        return SlopeSolver.target_slope(
+            co=co,
+            start=start,
+            end=end,
+            min_grade=Units.mode_to_grade(value=min_grade, mode=mode),
+            max_grade=Units.mode_to_grade(value=max_grade, mode=mode),
+            lengths=lengths
+        )
+
+    @staticmethod
+    def q_slope(co, lengths=None, distances=None):
+        # heights for the same slope from the upper end point to the lower one
+        #   returns heights in the points order and angle in radians
+        if co[0, 2] < co[-1, 2]:
+            heights, radians = SlopeSolver.q_slope(
+                co=co[::-1],
+                lengths=None if lengths is None else lengths[::-1],
+                distances=None if distances is None else distances[-1] - distances[::-1]
+            )
+            return heights[::-1], radians
+        return SlopeSolver.q_slope(co=co, lengths=lengths, distances=distances)
+
+    @classmethod
+    def q_slope_loops(cls, loops, workers=None):
+        # q_slope for many independent loops [Loop, ...] on thread pool (NumPy releases GIL)
+        #   loops are split to contiguous groups - one group for each worker
+        #   workers - None - by the number of cpu cores from threads_min_vertices in total, 1 - sequentially
+        #   returns [(heights, radians), ...] in the loops order, None for vertical loops (ValueError of q_slope)
+        if workers is None:
+            workers = os.cpu_count() or 1 if sum(len(loop) for loop in loops) >= cls.threads_min_vertices else 1
+        workers = min(workers, len(loops))
+        if workers < 2:
+            return cls._q_slope_group(loops=loops)
+        bounds = np.linspace(0, len(loops), workers + 1).astype(int)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            groups = executor.map(
+                lambda group: cls._q_slope_group(loops=group),
+                (loops[start:stop] for start, stop in zip(bounds[:-1], bounds[1:]))
+            )
+            return [result for group in groups for result in group]
+
+    @classmethod
+    def _q_slope_group(cls, loops):
+        # q_slope for each of the loops, None for vertical loops
+        results = []
+        for loop in loops:
+            try:
+                results.append(cls.q_slope(co=loop.co, distances=loop.distances))
+            except ValueError:
+                results.append(None)
+        return results
+
+
+# POLYLINE STREAM
+
+class PolylineStream:
+
+    # Slope for very long ordered polylines by fixed-size blocks, memory doesn't depend on polyline length
+    #   read(start, stop) - returns (k, 3) coordinates array of the polyline points [start, stop)
+    #   write(start, stop, heights) - saves new heights of the polyline points [start, stop)
+    #   each block is written before the next one is read
+
+    block_size = 65536
+
+    @classmethod
+    def make_slope(cls, read, write, count, value, mode, result_mode='EACH_SLOPE', block_size=None):
+        # heights for the desired slope value starting from the first point
+        grade = Units.grade(value=value, mode=mode)
+        ranges = cls._ranges(count=count, block_size=block_size)
+        blocks = (read(start, stop) for start, stop in ranges)
+        if result_mode == 'FULL_SLOPE':
+            heights_blocks = SlopeSolver.full_slope_blocks(blocks=blocks, grade=grade)
+        elif result_mode == 'EACH_SLOPE':
+            heights_blocks = SlopeSolver.each_slope_blocks(blocks=blocks, grade=grade)
+        else:
+            return
+        for (start, stop), heights in zip(ranges, heights_blocks):
+            write(start, stop, heights)
+
+    @classmethod
+    def q_slope(cls, read, write, count, block_size=None):
+        # heights for the same slope from the upper end point to the lower one
+        #   two passes - for the polyline length and for the heights, returns angle in radians
+        #   raises ValueError without writing heights for vertical polyline (without XY length or with vertical angle)
+        first = read(0, 1)[0, 2]
+        last = read(count - 1, count)[0, 2]
+        # go from the upper end
+        reverse = first < last
+        ranges = cls._ranges(count=count, block_size=block_size, reverse=reverse)
+        loop_proj_length = SlopeSolver.length_blocks(
+            blocks=(cls._read(read=read, start=start, stop=stop, reverse=reverse) for start, stop in ranges)
+        )
+        radians = SlopeSolver.q_slope_angle(diff=abs(first - last), loop_proj_length=loop_proj_length)
+        heights_blocks = SlopeSolver.each_slope_blocks(
+            blocks=(cls._read(read=read, start=start, stop=stop, reverse=reverse) for start, stop in ranges),
+            grade=Units.radians_to_grade(radians=radians),
+            direction=-1.0
+        )
+        for (start, stop), heights in zip(ranges, heights_blocks):
+            write(start, stop, heights[::-1] if reverse else heights)
+        return radians
+
+    @classmethod
+    def _ranges(cls, count, block_size=None, reverse=False):
+        # (start, stop) of blocks from the first point or from the last point if reverse
+        block_size = block_size if block_size else cls.block_size
+        ranges = [(start, min(start + block_size, count)) for start in range(0, count, block_size)]
+        return ranges[::-1] if reverse else ranges
+
+    @staticmethod
+    def _read(read, start, stop, reverse):
+        # read block, points in the reversed order if reverse
+        co = read(start, stop)
+        return co[::-1] if reverse else co
@@ -0,0 +1,311 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Tests for the add-on selection ordering and operations, run without Blender with the benchmarks bpy / bmesh stand-in:
+#       python -m unittest discover -s tests
+
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import stand_in
+stand_in.install()
+import bpy
+from slope_loop.addon import LastSolveCache, LoopsCache, MeshIO, SlopeLoop, SlopeLoopStats, core
+
+# operators context and operator without reports
+CONTEXT = types.SimpleNamespace(
+    tool_settings=types.SimpleNamespace(mesh_select_mode=(True, False, False)),
+    scene=types.SimpleNamespace(slope_loop_prop_mode='Percents')
+)
+QUIET = types.SimpleNamespace(report=lambda type, message: None)
+
+
+def mesh(co, edges, active=None):
+    # mesh data (MeshIO) stand-in with all edges selected
+    edges = np.array(edges, dtype=np.int32)
+    return types.SimpleNamespace(
+        co=np.array(co, dtype=np.float64),
+        active=None if active is None else (active, ),
+        selected_edges=lambda: edges
+    )
+
+
+def mesh_object(co, edges, selected, active):
+    # stand-in mesh object with selected vertices and edges between them, active - the select history vertex
+    data = bpy.data.meshes.new('mesh')
+    data.vertices.add(len(co))
+    data.vertices.foreach_set('co', np.array(co, dtype=np.float32).ravel())
+    data.edges.add(len(edges))
+    data.edges.foreach_set('vertices', np.array(edges, dtype=np.int32).ravel())
+    select(data=data, selected=selected)
+    data.select_history = [active]
+    return bpy.data.objects.new('object', data)
+
+
+def select(data, selected):
+    # select vertices and edges between them
+    vertices = np.zeros(len(data.vertices), dtype=bool)
+    vertices[selected] = True
+    edges = np.empty(len(data.edges) * 2, dtype=np.int32)
+    data.edges.foreach_get('vertices', edges)
+    data.vertices.foreach_set('select', vertices)
+    data.edges.foreach_set('select', vertices[edges[0::2]] & vertices[edges[1::2]])
+
+
+def heights(ob):
+    co = np.empty(len(ob.data.vertices) * 3, dtype=np.float32)
+    ob.data.vertices.foreach_get('co', co)
+    return co[2::3]
+
+
+class MeshIOTest(unittest.TestCase):
+
+    def test_write_changed_blocks(self):
+        ob = mesh_object(co=[(i, 0, 0) for i in range(200)], edges=[], selected=[], active=0)
+        data = MeshIO(mesh=ob.data)
+        for start in range(0, 150, 50):
+            data.set_heights(indices=np.arange(start, start + 60), heights=np.full(60, start + 1.0))
+        self.assertEqual(int(data._changed.sum()), 160)
+        data.write()
+        self.assertFalse(data._changed.any())
+        np.testing.assert_array_equal(heights(ob=ob), np.repeat([1.0, 51.0, 101.0, 0.0], [50, 50, 60, 40]))
+
+
+class ObjectsTest(unittest.TestCase):
+
+    def test_linked_duplicates_are_processed_once(self):
+        ob = mesh_object(co=[(0, 0, 0), (1, 0, 0), (2, 0, 0)], edges=[[0, 1], [1, 2]], selected=[0, 1, 2], active=0)
+        duplicate = bpy.data.objects.new('duplicate', ob.data)
+        other = mesh_object(co=[(0, 0, 0), (1, 0, 0)], edges=[[0, 1]], selected=[0, 1], active=0)
+        self.assertEqual(SlopeLoop._objects_with_selection(context=CONTEXT, objects=[duplicate, other, ob]),
+                         [duplicate, other])
+
+
+class MakeSlopeOrderingTest(unittest.TestCase):
+
+    co = [(0, 0, 0), (1, 0, 0), (2, 0, 0), (0, 1, 0), (-1, -1, 0), (-0.5, -0.5, 0)]
+    # Y shape - junction 0 with branches 0-1-2, 0-3 and 0-5-4
+    edges = [[0, 1], [1, 2], [0, 3], [0, 5], [5, 4]]
+
+    def test_network_from_end_vertex_does_not_depend_on_edges_order(self):
+        for shift in range(len(self.edges)):
+            edges = self.edges[shift:] + self.edges[:shift]
+            data = mesh(co=self.co, edges=edges, active=4)
+            loop, distances, junctions, unreached = SlopeLoop._make_slope_ordering(
+                mesh=data, selected_edges=data.selected_edges(), select_mode='VERT')
+            self.assertIsNotNone(distances)
+            self.assertEqual(loop.indices[0], 4)
+            self.assertEqual(sorted(loop.indices.tolist()), [0, 1, 2, 3, 4, 5])
+            self.assertEqual((junctions, unreached), (1, 0))
+
+    def test_simple_loop_from_active_vertex(self):
+        for edges in ([[0, 1], [1, 2], [2, 3]], [[3, 2], [2, 1], [1, 0]]):
+            data = mesh(co=[(i, 0, 0) for i in range(4)], edges=edges, active=3)
+            loop, distances, junctions, unreached = SlopeLoop._make_slope_ordering(
+                mesh=data, selected_edges=data.selected_edges(), select_mode='VERT')
+            self.assertIsNone(distances)
+            self.assertEqual(loop.indices.tolist(), [3, 2, 1, 0])
+            np.testing.assert_allclose(loop.distances, [0.0, 1.0, 2.0, 3.0])
+
+    def test_not_connected_vertices(self):
+        data = mesh(co=[(i, 0, 0) for i in range(5)], edges=[[0, 1], [1, 2], [3, 4]], active=0)
+        loop, distances, junctions, unreached = SlopeLoop._make_slope_ordering(
+            mesh=data, selected_edges=data.selected_edges(), select_mode='VERT')
+        self.assertEqual(loop.indices.tolist(), [0, 1, 2])
+        self.assertEqual(unreached, 2)
+
+
+class IncrementalMakeSlopeTest(unittest.TestCase):
+
+    def tearDown(self):
+        SlopeLoop._incremental = True
+        LoopsCache.clear()
+        LastSolveCache.clear()
+
+    def edit_and_solve(self, result_mode, incremental):
+        # solve, move a vertex near the end, solve, extend the selection, solve - returns heights and last stats
+        SlopeLoop._incremental = incremental
+        LoopsCache.clear()
+        LastSolveCache.clear()
+        random = np.random.RandomState(0)
+        co = np.column_stack((np.arange(40.0), random.random_sample(40), random.random_sample(40)))
+        ob = mesh_object(co=co, edges=[[i, i + 1] for i in range(39)], selected=np.arange(30), active=0)
+        stats = []
+
+        def solve():
+            stats.append(SlopeLoopStats(operation='Make Slope'))
+            SlopeLoop._make_slope_loop(context=CONTEXT, ob=ob, slope_mode='Percents', value=5.0, op=QUIET,
+                                       result_mode=result_mode, stats=stats[-1])
+
+        solve()
+        ob.data.vertices[25].co.x += 0.5
+        solve()
+        select(data=ob.data, selected=np.arange(36))
+        solve()
+        return heights(ob=ob), [item.counters.get('reused_vertices') for item in stats]
+
+    def test_equals_full_solve(self):
+        for result_mode in ('EACH_SLOPE', 'FULL_SLOPE'):
+            heights, reused = self.edit_and_solve(result_mode=result_mode, incremental=True)
+            expected, _ = self.edit_and_solve(result_mode=result_mode, incremental=False)
+            np.testing.assert_array_equal(heights, expected)
+            self.assertEqual(reused, [None, 25, 30])
+
+
+class QSlopeTest(unittest.TestCase):
+
+    def tearDown(self):
+        SlopeLoop._block_size = 0
+        LoopsCache.clear()
+
+    def test_vertical_loop_is_skipped(self):
+        # loop 0-1-2 on one XY point and sloped loop 3-4-5
+        co = [(0, 0, 5.0), (0, 0, 1.0), (0, 0, 0.0), (0, 1, 3.0), (1, 1, 2.0), (2, 1, 0.0)]
+        for block_size in (0, 2):
+            SlopeLoop._block_size = block_size
+            ob = mesh_object(co=co, edges=[[0, 1], [1, 2], [3, 4], [4, 5]], selected=np.arange(6), active=0)
+            reports = []
+            angles = SlopeLoop._q_slope_loop(
+                context=CONTEXT,
+                ob=ob,
+                op=types.SimpleNamespace(report=lambda type, message: reports.append((type, message)))
+            )
+            self.assertEqual(len(angles), 1)
+            self.assertIn(({'WARNING'}, 'QSlope skipped vertical loops: 1'), reports)
+            # angle is rounded to 4 digits (LEGACY)
+            np.testing.assert_allclose(heights(ob=ob), [5.0, 1.0, 0.0, 3.0, 1.5, 0.0], atol=1e-3)
+
+
+class AnalyseExportTest(unittest.TestCase):
+
+    def analyse(self, extension):
+        # analyse the object with a vertical edge and the name to quote, returns the exported file text
+        ob = mesh_object(co=[(0, 0, 0), (10, 0, 1), (10, 0, 3)], edges=[[0, 1], [1, 2]], selected=[0, 1, 2],
+                         active=0)
+        ob.name = 'road "A", east'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'slopes' + extension)
+            SlopeLoop.analyse(context=CONTEXT, objects=[ob], output=path, op=QUIET)
+            with open(path) as output:
+                return output.read()
+
+    def test_csv_quotes_object_name(self):
+        rows = list(csv.reader(io.StringIO(self.analyse(extension='.csv'))))
+        self.assertEqual(rows[0], ['object', 'vertex_1', 'vertex_2', 'slope_percents'])
+        self.assertEqual([row[:3] for row in rows[1:]], [['road "A", east', '0', '1'], ['road "A", east', '1', '2']])
+        self.assertAlmostEqual(float(rows[1][3]), 10.0)
+        self.assertEqual(float(rows[2][3]), float('inf'))
+
+    def test_json_vertical_slope_is_none(self):
+        result = json.loads(self.analyse(extension='.json'))
+        ob_result = result['objects']['road "A", east']
+        self.assertEqual(result['mode'], 'Percents')
+        self.assertAlmostEqual(ob_result['slopes'][0], 10.0)
+        self.assertIsNone(ob_result['slopes'][1])
+        self.assertEqual(ob_result['summary']['infinite'], 1)
+        self.assertEqual([loop['slopes'][1] for loop in ob_result['loops']], [None])
+
+
+class LoopsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.size, self.max_bytes = LoopsCache.size, LoopsCache.max_bytes
+        LoopsCache.clear()
+
+    def tearDown(self):
+        LoopsCache.size, LoopsCache.max_bytes = self.size, self.max_bytes
+        LoopsCache.clear()
+
+    def test_count_eviction(self):
+        LoopsCache.size = 2
+        for key in ('a', 'b', 'c'):
+            LoopsCache.put(key=key, value=np.zeros(1))
+            if key == 'b':
+                LoopsCache.get(key='a')
+        self.assertIsNone(LoopsCache.get(key='b'))
+        self.assertIsNotNone(LoopsCache.get(key='a'))
+        self.assertIsNotNone(LoopsCache.get(key='c'))
+        self.assertEqual(LoopsCache._bytes, 16)
+
+    def test_bytes_eviction(self):
+        LoopsCache.max_bytes = 1000
+        LoopsCache.put(key='a', value=core.Loop(indices=np.arange(10), co=np.zeros((10, 3))))
+        self.assertEqual(LoopsCache._bytes, 80 + 240 + 72 + 80)
+        LoopsCache.put(key='b', value=(np.zeros(60), [np.zeros(10)]))
+        self.assertIsNone(LoopsCache.get(key='a'))
+        self.assertEqual(LoopsCache._bytes, 560)
+        # replaced value is not counted twice, value over max_bytes is not cached
+        LoopsCache.put(key='b', value=np.zeros(100))
+        self.assertEqual(LoopsCache._bytes, 800)
+        LoopsCache.put(key='c', value=np.zeros(200))
+        self.assertIsNone(LoopsCache.get(key='c'))
+        self.assertEqual(LoopsCache._bytes, 800)
+
+
+class StatsTest(unittest.TestCase):
+
+    def tearDown(self):
+        SlopeLoopStats.handlers = []
+
+    def make_slope(self, stats_enabled):
+        # Make Slope on a simple loop with the scene stats properties, returns the scene and stats passed to handler
+        ob = mesh_object(co=[(i, 0, 0) for i in range(5)], edges=[[i, i + 1] for i in range(4)], selected=range(5),
+                         active=0)
+        scene = types.SimpleNamespace(slope_loop_prop_mode='Percents', slope_loop_prop_stats=stats_enabled,
+                                      slope_loop_prop_stats_last='')
+        context = types.SimpleNamespace(tool_settings=CONTEXT.tool_settings, scene=scene, active_object=ob)
+        handled = []
+        SlopeLoopStats.handlers = [handled.append]
+        SlopeLoop.make_slope_loop(context=context, objects=[ob], slope_mode='Percents', value=10.0, op=QUIET,
+                                  result_mode='EACH_SLOPE')
+        return scene, handled
+
+    def test_handlers_and_scene_property(self):
+        scene, handled = self.make_slope(stats_enabled=True)
+        self.assertEqual(len(handled), 1)
+        self.assertEqual(json.loads(scene.slope_loop_prop_stats_last), json.loads(json.dumps(handled[0])))
+        stats = handled[0]
+        self.assertEqual(stats['operation'], 'Make Slope')
+        self.assertEqual(list(stats['phases']), ['mesh_read', 'ordering', 'solve', 'mesh_write'])
+        self.assertEqual((stats['counters']['objects'], stats['counters']['vertices'], stats['counters']['loops']),
+                         (1, 5, 1))
+
+    def test_disabled(self):
+        scene, handled = self.make_slope(stats_enabled=False)
+        self.assertEqual(handled, [])
+        self.assertEqual(scene.slope_loop_prop_stats_last, '')
+
+
+class QSlopeOrderingTest(unittest.TestCase):
+
+    def test_cycle_through_junction_is_skipped(self):
+        # stick 0-1-2 and ring 2-3-4-2 through the junction 2
+        data = mesh(co=[(0, 0, 5), (1, 0, 4), (2, 0, 3), (3, 0, 2.5), (3, 1, 1)],
+                    edges=[[0, 1], [1, 2], [2, 3], [3, 4], [4, 2]])
+        loops, junctions, cycles = SlopeLoop._q_slope_ordering(mesh=data)
+        self.assertEqual([sorted(loop.indices.tolist()) for loop in loops], [[0, 1, 2]])
+        self.assertEqual(junctions.tolist(), [2])
+        self.assertEqual(cycles, 1)
+
+    def test_ring_without_junctions_is_skipped(self):
+        data = mesh(co=[(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], edges=[[0, 1], [1, 2], [2, 3], [3, 0]])
+        loops, junctions, cycles = SlopeLoop._q_slope_ordering(mesh=data)
+        self.assertEqual(loops, [])
+        self.assertEqual(cycles, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,344 @@
+# Nikita Akimov
+# interplanety@interplanety.org
+#
+# GitHub
+#    https://github.com/Korchy/1d_slope_loop
+#
+# Tests for slope_loop.core, run without Blender:
+#       python -m unittest discover -s tests
+
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from slope_loop import core
+from slope_loop.core import Loop, LoopsSorter, Network, Neighbours, Polyline, PolylineStream, SlopeAnalysis, SlopeSolver, \
+    Units
+
+
+def polyline(size, seed=0):
+    # open polyline with random heights
+    random = np.random.RandomState(seed)
+    x = np.arange(size, dtype=np.float64)
+    return np.column_stack((x, np.sin(x * 0.3) * 2.0, random.random_sample(size)))
+
+
+def stream(co, block_size, method, **kwargs):
+    # PolylineStream solve over a copy of co, returns new heights and the method result
+    co = co.copy()
+
+    def read(start, stop):
+        return co[start:stop]
+
+    def write(start, stop, heights):
+        co[start:stop, 2] = heights
+
+    result = method(read=read, write=write, count=len(co), block_size=block_size, **kwargs)
+    return co[:, 2], result
+
+
+class LoopsSorterTest(unittest.TestCase):
+
+    # Y shape - junction 0 with branches 0-1-2, 0-3 and 0-5-4
+    y_edges = [[0, 1], [1, 2], [0, 3], [0, 5], [5, 4]]
+
+    @staticmethod
+    def _paths_set(paths):
+        # paths without direction
+        return {tuple(min(path, path[::-1])) for path in paths}
+
+    def test_paths_between_nodes(self):
+        paths, rings = LoopsSorter.paths(adjacency=LoopsSorter.adjacency(edges=self.y_edges))
+        self.assertEqual(self._paths_set(paths), {(0, 1, 2), (0, 3), (0, 5, 4)})
+        self.assertEqual(rings, [])
+
+    def test_paths_do_not_depend_on_edges_order(self):
+        expected = self._paths_set(LoopsSorter.paths(adjacency=LoopsSorter.adjacency(edges=self.y_edges))[0])
+        for shift in range(1, len(self.y_edges)):
+            edges = self.y_edges[shift:] + self.y_edges[:shift]
+            for nodes in ((), (4, )):
+                paths, _ = LoopsSorter.paths(adjacency=LoopsSorter.adjacency(edges=edges), nodes=nodes)
+                self.assertEqual(self._paths_set(paths), expected)
+
+    def test_passed_node_splits_path(self):
+        paths, _ = LoopsSorter.paths(adjacency=LoopsSorter.adjacency(edges=[[0, 1], [1, 2], [2, 3]]), nodes=(1, ))
+        self.assertEqual(self._paths_set(paths), {(0, 1), (1, 2, 3)})
+
+    def test_ring_without_nodes(self):
+        paths, rings = LoopsSorter.paths(adjacency=LoopsSorter.adjacency(edges=[[0, 1], [1, 2], [2, 3], [3, 0]]))
+        self.assertEqual(paths, [])
+        self.assertEqual(len(rings), 1)
+        self.assertEqual(sorted(rings[0]), [0, 1, 2, 3])
+
+    def test_cycle_through_node(self):
+        # stick 0-1-2 and ring 2-3-4-2 through the junction 2
+        adjacency = LoopsSorter.adjacency(edges=[[0, 1], [1, 2], [2, 3], [3, 4], [4, 2]])
+        paths, rings = LoopsSorter.paths(adjacency=adjacency)
+        self.assertEqual(rings, [])
+        cycles = [path for path in paths if path[0] == path[-1]]
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(cycles[0][0], 2)
+        self.assertEqual(sorted(cycles[0][1:-1]), [3, 4])
+
+
+class NetworkTest(unittest.TestCase):
+
+    def test_distances_from_end_vertex(self):
+        # Y shape on XY plane, root - end of the branch 0-5-4
+        co = np.array([(0, 0, 0), (1, 0, 0), (2, 0, 0), (0, 1, 0), (-2, 0, 0), (-1, 0, 0)], dtype=np.float64)
+        adjacency = LoopsSorter.adjacency(edges=LoopsSorterTest.y_edges)
+        paths, _ = LoopsSorter.paths(adjacency=adjacency, nodes=(4, ))
+        vertices, distances = Network.distances(co=co, paths=paths, root=4)
+        self.assertEqual(vertices[0], 4)
+        self.assertEqual(sorted(vertices.tolist()), [0, 1, 2, 3, 4, 5])
+        by_vertex = dict(zip(vertices.tolist(), distances.tolist()))
+        for vertex, distance in {4: 0.0, 5: 1.0, 0: 2.0, 1: 3.0, 2: 4.0, 3: 3.0}.items():
+            self.assertAlmostEqual(by_vertex[vertex], distance)
+
+    def test_distances_around_ring(self):
+        # square ring through the root, the far corner is reached by the shortest way
+        co = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], dtype=np.float64)
+        adjacency = LoopsSorter.adjacency(edges=[[0, 1], [1, 2], [2, 3], [3, 0]])
+        paths, _ = LoopsSorter.paths(adjacency=adjacency, nodes=(0, ))
+        vertices, distances = Network.distances(co=co, paths=paths, root=0)
+        by_vertex = dict(zip(vertices.tolist(), distances.tolist()))
+        self.assertEqual(by_vertex, {0: 0.0, 1: 1.0, 2: 2.0, 3: 1.0})
+
+    def test_make_slope(self):
+        co = np.array([(0, 0, 1.0), (10, 0, 5.0), (20, 0, 0.0)])
+        heights = Network.make_slope(co=co, vertices=np.array([0, 1, 2]), distances=np.array([0.0, 10.0, 20.0]),
+                                     value=10.0, mode='Percents')
+        grade = Units.grade(value=10.0, mode='Percents')
+        np.testing.assert_allclose(heights, [1.0, 1.0 + 10.0 * grade, 1.0 + 20.0 * grade])
+
+
+class SlopeSolverTest(unittest.TestCase):
+
+    def test_target_slope_reaches_end_within_limits(self):
+        co = np.array([(i * 10.0, 0.0, z) for i, z in enumerate([0.0, 5.0, 3.0, 4.0, 10.0, 2.0])])
+        heights, infeasible = SlopeSolver.target_slope(co=co, start=0.0, end=3.0, min_grade=-0.08, max_grade=0.08)
+        self.assertAlmostEqual(heights[0], 0.0)
+        self.assertAlmostEqual(heights[-1], 3.0)
+        grades = np.diff(heights) / 10.0
+        self.assertTrue(np.all(grades >= -0.08 - 1e-9) and np.all(grades <= 0.08 + 1e-9))
+        self.assertFalse(infeasible.any())
+
+    def test_target_slope_infeasible(self):
+        co = np.array([(i * 10.0, 0.0, 0.0) for i in range(6)])
+        heights, infeasible = SlopeSolver.target_slope(co=co, start=0.0, end=40.0, min_grade=-0.08, max_grade=0.08)
+        self.assertAlmostEqual(heights[-1], 40.0)
+        self.assertTrue(infeasible.all())
+
+    def test_each_slope_grade(self):
+        co = polyline(size=20)
+        heights = SlopeSolver.each_slope(co=co, grade=0.1)
+        np.testing.assert_allclose(np.diff(heights), SlopeSolver.segments_lengths(co=co) * 0.1)
+        self.assertEqual(heights[0], co[0, 2])
+
+
+class PolylineStreamTest(unittest.TestCase):
+
+    def test_make_slope_equals_in_memory(self):
+        co = polyline(size=101)
+        for result_mode in ('EACH_SLOPE', 'FULL_SLOPE'):
+            expected = Polyline.make_slope(co=co, value=10.0, mode='Percents', result_mode=result_mode)
+            for block_size in (1, 7, 100, 1000):
+                heights, _ = stream(co=co, block_size=block_size, method=PolylineStream.make_slope, value=10.0,
+                                    mode='Percents', result_mode=result_mode)
+                np.testing.assert_allclose(heights, expected, rtol=1e-12, atol=1e-12)
+
+    def test_q_slope_equals_in_memory(self):
+        for reverse in (False, True):
+            co = polyline(size=57)
+            co[:, 2] = np.linspace(3.0, 0.0, len(co)) + co[:, 2] * 0.1
+            if reverse:
+                co = co[::-1].copy()
+            expected, expected_radians = Polyline.q_slope(co=co)
+            for block_size in (1, 5, 57):
+                heights, radians = stream(co=co, block_size=block_size, method=PolylineStream.q_slope)
+                np.testing.assert_allclose(heights, expected, rtol=1e-12, atol=1e-12)
+                self.assertEqual(radians, expected_radians)
+
+
+    def test_q_slope_vertical_is_not_written(self):
+        for z in ((5.0, 0.0), (2.0, 2.0)):
+            co = np.array([(1.0, 1.0, z[0]), (1.0, 1.0, 1.0), (1.0, 1.0, z[1])])
+            with self.assertRaises(ValueError):
+                Polyline.q_slope(co=co)
+            written = []
+            with self.assertRaises(ValueError):
+                PolylineStream.q_slope(read=lambda start, stop: co[start:stop],
+                                       write=lambda start, stop, heights: written.append(heights),
+                                       count=len(co), block_size=2)
+            self.assertEqual(written, [])
+
+
+class NeighboursTest(unittest.TestCase):
+
+    # 3 x 5 grid, the middle row 5..9 is the source loop
+    edges = [[row * 5 + column, row * 5 + column + 1] for row in range(3) for column in range(4)] \
+        + [[row * 5 + column, (row + 1) * 5 + column] for row in range(2) for column in range(5)]
+
+    def test_align_first_ring(self):
+        heights = np.zeros(15)
+        heights[5:10] = 2.0
+        locked = np.zeros(15, dtype=bool)
+        locked[5:10] = True
+        moved, new_heights = Neighbours.align(heights=heights, edges=self.edges, sources=np.arange(6, 9),
+                                              locked=locked)
+        self.assertEqual(sorted(moved.tolist()), [1, 2, 3, 11, 12, 13])
+        np.testing.assert_allclose(new_heights, 2.0)
+
+    def test_align_locked_and_falloff(self):
+        # line 0-1-2-3-4, source 0, vertex 2 locked - 3 and 4 are not reached
+        heights = np.array([4.0, 0.0, 0.0, 0.0, 0.0])
+        locked = np.array([True, False, True, False, False])
+        moved, new_heights = Neighbours.align(heights=heights, edges=[[0, 1], [1, 2], [2, 3], [3, 4]],
+                                              sources=[0], locked=locked, depth=3, falloff='LINEAR')
+        self.assertEqual(moved.tolist(), [1])
+        np.testing.assert_allclose(new_heights, [4.0])
+        # without lock - linear falloff by rings
+        moved, new_heights = Neighbours.align(heights=heights, edges=[[0, 1], [1, 2], [2, 3], [3, 4]],
+                                              sources=[0], locked=np.zeros(5, dtype=bool), depth=2, falloff='LINEAR')
+        self.assertEqual(moved.tolist(), [1, 2])
+        np.testing.assert_allclose(new_heights, [4.0, 2.0])
+
+
+class SlopeAnalysisTest(unittest.TestCase):
+
+    def test_grades(self):
+        # sloped, vertical and zero length edges
+        co = np.array([(0, 0, 0), (3, 4, 1), (3, 4, 2), (3, 4, 2)], dtype=np.float64)
+        grades = SlopeAnalysis.grades(co=co, edges=[[0, 1], [1, 2], [2, 3], [1, 0]])
+        np.testing.assert_array_equal(grades, [0.2, np.inf, 0.0, 0.2])
+
+    def test_summary_with_infinite_values(self):
+        summary = SlopeAnalysis.summary(values=np.array([0.1, 0.5, np.inf, 2.0]), bins=4)
+        self.assertEqual((summary['count'], summary['infinite']), (4, 1))
+        self.assertEqual((summary['min'], summary['max']), (0.1, 2.0))
+        self.assertAlmostEqual(summary['mean'], 2.6 / 3.0)
+        self.assertEqual(summary['histogram']['counts'], [1, 1, 0, 1])
+        self.assertEqual(summary['histogram']['bounds'], [0.0, 0.5, 1.0, 1.5, 2.0])
+
+    def test_summary_limit_clamps_to_last_bin(self):
+        summary = SlopeAnalysis.summary(values=np.array([0.1, 0.5, np.inf, 2.0, 7.0]), bins=4, limit=1.0)
+        self.assertEqual(summary['histogram']['counts'], [1, 0, 1, 2])
+        self.assertEqual(summary['histogram']['bounds'], [0.0, 0.25, 0.5, 0.75, 1.0])
+        self.assertEqual(summary['max'], 7.0)
+
+    def test_summary_of_vertical_only(self):
+        summary = SlopeAnalysis.summary(values=np.array([np.inf, np.inf]), bins=2)
+        self.assertEqual((summary['count'], summary['infinite']), (2, 2))
+        self.assertIsNone(summary['max'])
+        self.assertEqual(summary['histogram']['counts'], [0, 0])
+
+
+class UnitsTest(unittest.TestCase):
+
+    def test_legacy_grade(self):
+        radians = round(np.arctan(0.1), 4)
+        self.assertEqual(Units.grade(value=10.0, mode='Percents', rounding='LEGACY'),
+                         1.0 / round(np.tan(np.radians(90) - radians), 4))
+
+    def test_exact_grade(self):
+        self.assertEqual(Units.grade(value=10.0, mode='Percents', rounding='EXACT'), 0.1)
+        self.assertAlmostEqual(Units.grade(value=45.0, mode='Degrees', rounding='EXACT'), 1.0)
+
+    def test_vertical_slope(self):
+        with self.assertRaises(ValueError):
+            Units.grade(value=90.0, mode='Degrees')
+        with self.assertRaises(ValueError):
+            Units.grade(value=float('inf'), mode='Percents', rounding='EXACT')
+
+    def test_round_trip(self):
+        for mode in Units.modes:
+            converter = Units.converter(mode=mode)
+            self.assertAlmostEqual(converter.from_radians(radians=converter.to_radians(value=10.0)), 10.0, places=3)
+
+
+class LoopTest(unittest.TestCase):
+
+    def test_geometry(self):
+        co = np.array([(0, 0, 0), (3, 4, 1), (3, 4, 2), (6, 8, 0)], dtype=np.float64)
+        loop = Loop(indices=[4, 5, 6, 7], co=co)
+        np.testing.assert_allclose(loop.lengths, [5.0, 0.0, 5.0])
+        np.testing.assert_allclose(loop.distances, [0.0, 5.0, 5.0, 10.0])
+        self.assertEqual(len(Loop(indices=[1, 2, 3])), 3)
+
+    def test_rebase_equals_new_loop(self):
+        co = polyline(size=50)
+        loop = Loop(indices=np.arange(50), co=co)
+        changed = np.concatenate((co[:40], polyline(size=15, seed=1)[5:] + (0.0, 0.5, 0.0)))
+        changed[45, 0] += 0.3
+        for first in (0, 1, 30, 40):
+            rebased = loop.rebase(indices=np.arange(60), co=changed, first=first)
+            expected = Loop(indices=np.arange(60), co=changed)
+            np.testing.assert_array_equal(rebased.lengths, expected.lengths)
+            np.testing.assert_array_equal(rebased.distances, expected.distances)
+
+
+class PolylineTest(unittest.TestCase):
+
+    def test_first_changed(self):
+        co = polyline(size=10)
+        self.assertEqual(Polyline.first_changed(co=co, previous=co.copy()), 10)
+        self.assertEqual(Polyline.first_changed(co=co, previous=co[:7]), 7)
+        moved = co.copy()
+        moved[[4, 8], 2] += 1.0
+        self.assertEqual(Polyline.first_changed(co=moved, previous=co), 4)
+
+    def test_make_slope_tail_equals_make_slope(self):
+        co = polyline(size=30)
+        distances = Loop(indices=np.arange(30), co=co).distances
+        for result_mode in ('EACH_SLOPE', 'FULL_SLOPE'):
+            expected = Polyline.make_slope(co=co, value=10.0, mode='Percents', result_mode=result_mode,
+                                           distances=distances)
+            for first in (0, 1, 17, 30):
+                heights = Polyline.make_slope_tail(co=co, first=first, value=10.0, mode='Percents',
+                                                   result_mode=result_mode, distances=distances)
+                np.testing.assert_array_equal(heights, expected[first:])
+
+    def test_q_slope_loops_threads_equal_sequential(self):
+        loops = []
+        for index, size in enumerate((3, 50, 7, 120, 4, 31, 9)):
+            co = polyline(size=size, seed=index)
+            loops.append(Loop(indices=np.arange(size), co=co[::-1].copy() if index % 2 else co))
+        expected = Polyline.q_slope_loops(loops=loops, workers=1)
+        for workers in (2, 3, 7, 16):
+            results = Polyline.q_slope_loops(loops=loops, workers=workers)
+            self.assertEqual(len(results), len(loops))
+            for (heights, radians), (expected_heights, expected_radians) in zip(results, expected):
+                np.testing.assert_array_equal(heights, expected_heights)
+                self.assertEqual(radians, expected_radians)
+
+    def test_q_slope_loops_threads_from_min_vertices(self):
+        # 4 loops with 80 vertices in total on 4 cpu cores
+        loops = [Loop(indices=np.arange(20), co=polyline(size=20, seed=index)) for index in range(4)]
+        for min_vertices, max_workers in ((81, None), (80, 4)):
+            with mock.patch.object(Polyline, 'threads_min_vertices', min_vertices), \
+                    mock.patch('os.cpu_count', return_value=4), \
+                    mock.patch.object(core, 'ThreadPoolExecutor', wraps=ThreadPoolExecutor) as executor:
+                self.assertEqual(len(Polyline.q_slope_loops(loops=loops)), 4)
+            if max_workers:
+                executor.assert_called_once_with(max_workers=max_workers)
+            else:
+                executor.assert_not_called()
+
+    def test_q_slope_loops_skips_vertical(self):
+        co = polyline(size=10)
+        loops = [Loop(indices=np.arange(10), co=co), Loop(indices=np.arange(3), co=np.array([(0, 0, 3.0)] * 3)),
+                 Loop(indices=np.arange(10), co=co[::-1].copy())]
+        for workers in (1, 3):
+            results = Polyline.q_slope_loops(loops=loops, workers=workers)
+            self.assertIsNone(results[1])
+            np.testing.assert_array_equal(results[0][0], Polyline.q_slope(co=co, distances=loops[0].distances)[0])
+            np.testing.assert_array_equal(results[2][0], Polyline.q_slope(co=loops[2].co, distances=loops[2].distances)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()